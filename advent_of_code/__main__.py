@@ -4,39 +4,45 @@ Run functions against downloaded input files.
 """
 
 import datetime
-import importlib
-import pyclbr
-import webbrowser
+import json
+import sys
 from pathlib import Path
 
 import click
 
 from . import __version__
-from .base import Puzzle
-from .util import get_data, create_new_template
+from .answers import AnswerMismatch
+from .bench import (
+    bench_record,
+    format_timings,
+    load_budgets,
+    puzzle_kwargs,
+    time_puzzle,
+)
+from .generators import available as available_generators, write_input
+from .history import (
+    append_records,
+    compare,
+    git_commit,
+    latest_durations,
+    load_records,
+    make_record,
+)
+from .runner import (
+    discover_puzzles,
+    format_table,
+    import_solution,
+    run_all,
+    RunOptions,
+    solve,
+    write_registry,
+)
+from .util import create_new_template, fetch_inputs, get_data, text_digest
 
 
 _today = default = datetime.date.today()
 
 
-def import_solution(year: int, day: int):
-    """Import puzzle class by year and day.
-
-    Raises:
-        ModuleNotFoundError: Module for day and year is not found.
-        UserWarning: Class that inherits Puzzle is not found in module.
-    """
-    module_name = f"advent_of_code.y{year - 2000}.day{day:02}"
-    day_module = importlib.import_module(module_name)
-
-    for name in pyclbr.readmodule(module_name):
-        cls_ = getattr(day_module, name)
-        if issubclass(cls_, Puzzle):
-            return cls_
-
-    raise UserWarning(f"No puzzle found in {module_name}")
-
-
 year_option = click.option(
     "--year",
     type=int,
@@ -67,29 +73,307 @@ def cli():
     default=1,
     help="Puzzle part. Default: 1.",
 )
-def run(year: int, day: int, part: int):
+@click.option(
+    "--all",
+    "all_",
+    is_flag=True,
+    help="Run both parts of all implemented puzzles in parallel.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes with --all. Default: number of CPUs.",
+)
+@click.option(
+    "--parse-cache/--no-parse-cache",
+    default=False,
+    envvar="AOC_PARSE_CACHE",
+    help="Store parsed inputs in the cache, reuse them on later runs.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    envvar="AOC_ANSWER_CACHE",
+    help="Reuse answers memoized for unchanged solution source and input.",
+)
+@click.option(
+    "--verify",
+    is_flag=True,
+    help="Recompute answers and compare them to memoized ones.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Read input lazily line by line, where the solution supports it.",
+)
+def run(
+    year: int,
+    day: int,
+    part: int,
+    all_: bool,
+    workers: int | None,
+    parse_cache: bool,
+    cache: bool,
+    verify: bool,
+    stream: bool,
+):
     """Run developed functions on Advent of Code data."""
+    options = RunOptions(
+        cache_parsed=parse_cache, cache_answers=cache, verify=verify, stream=stream
+    )
+    if all_:
+        results = []
+        durations = latest_durations(load_records())
+        for result in run_all(discover_puzzles(), workers, durations, options):
+            click.echo(f"{result.key}: {result.status}", err=True)
+            results.append(result)
+
+        commit = git_commit()
+        append_records(
+            make_record(
+                r.year, r.day, r.part, [r.seconds], r.input_hash, commit, source="run"
+            )
+            for r in results
+            if r.error is None and not (r.skipped or r.cached)
+        )
+        click.echo(format_table(results))
+        if any(r.error is not None for r in results):
+            raise SystemExit(1)
+        return
+
     try:
-        puzzle_cls = import_solution(year, day)
-        data = get_data(year=year, day=day)
-        puzzle = puzzle_cls(data)
+        solution, _, _ = solve(year, day, part, options)
     except (ModuleNotFoundError, UserWarning) as err:
         click.echo(str(err), err=True)
         return
+    except AnswerMismatch as err:
+        click.echo(str(err), err=True)
+        raise SystemExit(1) from err
 
-    solution = puzzle.part1() if part == 1 else puzzle.part2()
     click.echo(solution)
 
 
+def _parse_options(ctx, param, value: tuple[str, ...]) -> dict[str, str]:
+    """Parse repeated KEY=VALUE options to a dictionary."""
+    options = {}
+    for item in value:
+        key, sep, option = item.partition("=")
+        if not sep or not key:
+            raise click.BadParameter(f"expected KEY=VALUE, got {item!r}")
+        options[key] = option
+    return options
+
+
+@cli.group(invoke_without_command=True)
+@day_option
+@year_option
+@click.option(
+    "--part",
+    "parts",
+    type=click.IntRange(min=1, max=2),
+    multiple=True,
+    help="Puzzle part, can be given twice. Default: both parts.",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    help="Number of timed rounds. Default: 5.",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of untimed rounds before timing. Default: 1.",
+)
+@click.option(
+    "--json",
+    "json_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write timings to this JSON file.",
+)
+@click.option(
+    "--budget",
+    type=float,
+    default=None,
+    help="Fail, if median parse + solve time exceeds this many seconds.",
+)
+@click.option(
+    "--budgets",
+    "budgets_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help='JSON file of budgets in seconds by puzzle, e.g. {"2023/17/1": 2.5}.',
+)
+@click.option(
+    "--record/--no-record",
+    default=True,
+    help="Append timings to the history in the cache. Default: record.",
+)
+@click.option(
+    "--input",
+    "input_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Time on this input file, e.g. from `generate`. Default: cached input.",
+)
+@click.option(
+    "--option",
+    "puzzle_options",
+    multiple=True,
+    callback=_parse_options,
+    metavar="KEY=VALUE",
+    help=(
+        "Argument of the puzzle class, e.g. engine=bitset, converted to the type"
+        " of its default. Can be repeated."
+    ),
+)
+@click.pass_context
+def bench(
+    ctx: click.Context,
+    year: int,
+    day: int,
+    parts: tuple[int, ...],
+    repeat: int,
+    warmup: int,
+    json_path: Path | None,
+    budget: float | None,
+    budgets_path: Path | None,
+    record: bool,
+    input_path: Path | None,
+    puzzle_options: dict[str, str],
+):
+    """Time parsing and solving of a puzzle.
+
+    Timings are recorded in the history, see `bench compare`.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
+    try:
+        puzzle_cls = import_solution(year, day)
+        if input_path is not None:
+            data = input_path.read_text(encoding="utf-8")
+        else:
+            data = get_data(year=year, day=day)
+    except (ModuleNotFoundError, UserWarning) as err:
+        click.echo(str(err), err=True)
+        raise SystemExit(1) from err
+
+    try:
+        kwargs = puzzle_kwargs(puzzle_cls, puzzle_options)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="'--option'") from err
+
+    budgets = load_budgets(budgets_path) if budgets_path else {}
+    records = []
+    exceeded = []
+    for part in sorted(set(parts or (1, 2))):
+        timings = time_puzzle(
+            puzzle_cls, data, part, repeat=repeat, warmup=warmup, options=kwargs
+        )
+        click.echo(f"{year}/{day} part {part}, {repeat} rounds (ms):")
+        click.echo(format_timings(timings))
+
+        elapsed = timings["parse"].median + timings["solve"].median
+        part_budget = budgets.get(f"{year}/{day}/{part}", budget)
+        if part_budget is not None and elapsed > part_budget:
+            exceeded.append(f"{year}/{day}/{part}: {elapsed:.3f} s > {part_budget} s")
+
+        records.append(
+            bench_record(
+                year,
+                day,
+                part,
+                timings,
+                repeat=repeat,
+                warmup=warmup,
+                budget=part_budget,
+                **({"options": puzzle_options} if puzzle_options else {}),
+            )
+        )
+
+    if json_path is not None:
+        json_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    if record:
+        commit = git_commit()
+        input_hash = text_digest(data)
+        append_records(
+            make_record(
+                rec["year"],
+                rec["day"],
+                rec["part"],
+                [
+                    t_parse + t_solve
+                    for t_parse, t_solve in zip(
+                        rec["timings"]["parse"]["samples"],
+                        rec["timings"]["solve"]["samples"],
+                    )
+                ],
+                input_hash,
+                commit,
+                source="bench",
+                timings=rec["timings"],
+                **({"options": rec["options"]} if "options" in rec else {}),
+            )
+            for rec in records
+        )
+
+    if exceeded:
+        click.echo("Time budget exceeded:\n" + "\n".join(exceeded), err=True)
+        raise SystemExit(1)
+
+
+@bench.command(name="compare")
+@click.option(
+    "--head",
+    default=None,
+    help="Commit to be checked for slowdowns. Default: current commit.",
+)
+@click.option(
+    "--base",
+    default=None,
+    help="Reference commit. Default: latest other commit in history.",
+)
+@click.option(
+    "--alpha",
+    type=float,
+    default=0.05,
+    help="Significance level of the slowdown test. Default: 0.05.",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.05,
+    help="Minimum relative slowdown of median time. Default: 0.05.",
+)
+def bench_compare(head: str | None, base: str | None, alpha: float, threshold: float):
+    """Compare recorded timings between commits, flag slowdowns."""
+    head = head or git_commit()[0]
+    comparisons = compare(
+        load_records(), head=head, base=base, alpha=alpha, threshold=threshold
+    )
+    if not comparisons:
+        click.echo(f"No comparable timings found for commit {head[:10]}.", err=True)
+        return
+
+    for comp in comparisons:
+        flag = "SLOWER" if comp.slower else ""
+        click.echo(
+            f"{comp.key:<12} {comp.base[:10]} -> {comp.head[:10]}  "
+            f"{comp.base_median * 1000:>10.3f} ms -> "
+            f"{comp.head_median * 1000:>10.3f} ms"
+            f"  x{comp.ratio:.2f}  p={comp.p_value:.3f}  {flag}"
+        )
+    if any(comp.slower for comp in comparisons):
+        raise SystemExit(1)
+
+
 @cli.command(name="list")
 def list_puzzles():
     """List all puzzle solutions."""
-    module_ = pyclbr.readmodule_ex("advent_of_code")
-    mod_path = Path(module_["__path__"][0])
-    for child in sorted(
-        mod_path.rglob("y??/day??.py"), key=lambda p: p.parent.name + p.name
-    ):
-        print(child.relative_to(mod_path))
+    for year, day in discover_puzzles():
+        print(f"y{year - 2000}/day{day:02}.py")
 
 
 @cli.command
@@ -101,6 +385,13 @@ def new(year: int, day: int):
     dev, test = create_new_template(year, day)
     click.echo(f"- {dev}")
     click.echo(f"- {test}")
+    write_registry()
+
+
+@cli.command
+def index():
+    """Regenerate the registry of implemented puzzles."""
+    click.echo(f"Wrote {write_registry()}")
 
 
 @cli.command
@@ -115,11 +406,92 @@ def show_input(year: int, day: int):
         click.echo(err, err=True)
 
 
+def _parse_days(ctx, param, value: str) -> list[int]:
+    """Parse day specification like '1-25' or '1,3,5-7'."""
+    days = []
+    try:
+        for part in value.split(","):
+            first, _, last = part.partition("-")
+            days.extend(range(int(first), int(last or first) + 1))
+    except ValueError as err:
+        raise click.BadParameter(f"invalid day specification {value!r}") from err
+    if not all(1 <= day <= 25 for day in days):
+        raise click.BadParameter("days must be within 1-25")
+    return sorted(set(days))
+
+
+@cli.command
+@year_option
+@click.option(
+    "--days",
+    default="1-25",
+    callback=_parse_days,
+    help="Days to download, e.g. '1-25' or '1,3,5-7'. Default: 1-25.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Maximum number of concurrent downloads. Default: 4.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    help="Minimum time between starting downloads, in seconds. Default: 1.",
+)
+@click.option("--force", is_flag=True, help="Download also already cached inputs.")
+def fetch(year: int, days: list[int], workers: int, interval: float, force: bool):
+    """Download input files of several days to the cache."""
+    try:
+        outcomes = fetch_inputs(year, days, workers, interval, force)
+    except UserWarning as err:
+        click.echo(err, err=True)
+        raise SystemExit(1) from err
+
+    for day, outcome in outcomes.items():
+        click.echo(f"{year}/{day}: {outcome}")
+    if any(o not in ("cached", "downloaded") for o in outcomes.values()):
+        raise SystemExit(1)
+
+
+@cli.command
+@day_option
+@year_option
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    help="Input size relative to a personal puzzle input. Default: 1.",
+)
+@click.option("--seed", type=int, default=0, help="Random seed. Default: 0.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write input to this file. Default: standard output.",
+)
+def generate(year: int, day: int, scale: float, seed: int, output: Path | None):
+    """Generate a synthetic puzzle input of any size."""
+    if day not in available_generators(year):
+        click.echo(f"No input generator for {year}/{day}", err=True)
+        raise SystemExit(1)
+
+    if output is None:
+        write_input(sys.stdout, year, day, scale, seed)
+        return
+    with output.open("w", encoding="utf-8") as file_:
+        n_lines = write_input(file_, year, day, scale, seed)
+    click.echo(f"Wrote {n_lines} lines to {output}", err=True)
+
+
 @cli.command("open")
 @day_option
 @year_option
 def open_webpage(year: int, day: int):
     """Open Advent of Code webpage for given day."""
+    import webbrowser  # pylint: disable=import-outside-toplevel
+
     url = f"https://adventofcode.com/{year}/day/{day}"
     webbrowser.open(url)
 
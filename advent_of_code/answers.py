@@ -0,0 +1,116 @@
+"""Memoized puzzle answers.
+
+Answers are stored next to the cached input of each day, in one file
+`answers-<part>.json` per puzzle part, as parts are solved by separate
+workers in `run --all`. An answer is valid for one puzzle part, one
+input, and one version of the solution source: the day module and all
+modules of this package that it imports, directly or indirectly.
+"""
+
+import ast
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+from .util import _get_cache_dir, text_digest
+
+_package_root = Path(__file__).parent.parent
+
+
+class AnswerMismatch(Exception):
+    """Recomputed answer differs from the cached answer."""
+
+
+def _module_file(module_name: str) -> Path | None:
+    """Source file of a module in this package, None for other modules."""
+    if module_name.split(".")[0] != __package__:
+        return None
+    base = _package_root.joinpath(*module_name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _imported_modules(module_name: str, source: str) -> set[str]:
+    """Names of modules of this package imported in source."""
+    is_package = _module_file(module_name).name == "__init__.py"
+    package = module_name if is_package else module_name.rpartition(".")[0]
+
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            target = importlib.util.resolve_name(
+                "." * node.level + (node.module or ""), package
+            )
+            names.add(target)
+            names.update(f"{target}.{alias.name}" for alias in node.names)
+    return {name for name in names if _module_file(name) is not None}
+
+
+def source_digest(module_name: str) -> str:
+    """Digest of a module source, and the package modules it imports."""
+    sources = {}
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        if name in sources:
+            continue
+        source = _module_file(name).read_text(encoding="utf-8")
+        sources[name] = source
+        pending.extend(_imported_modules(name, source))
+    return text_digest("\0".join(f"{n}\0{sources[n]}" for n in sorted(sources)))
+
+
+class AnswerCache:
+
+    """Answers of one day's puzzle, for one input and solution source."""
+
+    def __init__(
+        self,
+        year: int,
+        day: int,
+        module_name: str,
+        input_text: str | None = None,
+        input_hash: str | None = None,
+    ):
+        """Create cache for input text, or for its digest, if already known."""
+        self._dir = _get_cache_dir(year=year, day=day)
+        input_hash = input_hash or text_digest(input_text)
+        self._key = f"{source_digest(module_name)}:{input_hash}"
+
+    def path(self, part: int) -> Path:
+        """File of cached answers to puzzle part."""
+        return self._dir / f"answers-{part}.json"
+
+    def _load(self, part: int) -> dict[str, str]:
+        path = self.path(part)
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def get(self, part: int) -> str | None:
+        """Cached answer to puzzle part, None if not found."""
+        return self._load(part).get(self._key)
+
+    def put(self, part: int, answer):
+        """Store answer to puzzle part."""
+        answers = self._load(part)
+        answers[self._key] = str(answer)
+        path = self.path(part)
+        tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(answers, indent=2), encoding="utf-8")
+        os.replace(tmp_file, path)
+
+    def verify(self, part: int, answer):
+        """Check answer against the cached one, if any.
+
+        Raises:
+            AnswerMismatch: Answers differ.
+        """
+        cached = self.get(part)
+        if cached is not None and cached != str(answer):
+            raise AnswerMismatch(f"Answer {answer} differs from cached {cached}")
@@ -1,14 +1,99 @@
 """Abstract base class for a day's advent calendar solution."""
 
+import inspect
+import os
+import pickle
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from functools import cached_property
+from pathlib import Path
+
+from .answers import source_digest
+from .util import _get_cache_root, text_digest
 
 
 class Puzzle(ABC):
-    """Base class for puzzle solutions."""
+    """Base class for puzzle solutions.
+
+    Solutions may override `parse` to convert the input text into a data
+    structure, which is then available to both parts as `parsed`.
+
+    Line-oriented solutions may instead read the input with `lines`, and
+    set `streaming`, so that they can be created with `from_lines` from a
+    lazy line source such as `util.LineReader`.
+
+    Attrs:
+        cache_parsed: Pickle the parsed input to disk, keyed by the input
+          text and the source of the solution module and the package
+          modules it imports, and load it from there on later runs. May
+          be set per instance, before the input is parsed.
+        streaming: Solution reads its input only through `lines`.
+    """
+
+    cache_parsed = False
+    streaming = False
+    _line_source: Iterable[str] | None = None
 
     def __init__(self, input_text: str) -> None:
         self.input_text = input_text
 
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Puzzle":
+        """Create puzzle from input lines.
+
+        Args:
+            lines: Re-iterable source of lines without line endings. If the
+              solution is not streaming, lines are joined to input text.
+        """
+        if not cls.streaming:
+            return cls("".join(f"{line}\n" for line in lines))
+        puzzle = cls("")
+        puzzle._line_source = lines
+        return puzzle
+
+    def lines(self) -> Iterator[str]:
+        """Iterate over input lines, lazily if created with `from_lines`."""
+        if self._line_source is not None:
+            return iter(self._line_source)
+        return iter(self.input_text.splitlines())
+
+    def parse(self):
+        """Returns parsed input, shared by both parts.
+
+        By default, the input text is returned as is.
+        """
+        return self.input_text
+
+    @cached_property
+    def parsed(self):
+        """Parsed input, computed once by `parse`."""
+        if not self.cache_parsed:
+            return self.parse()
+
+        cache_file = self._parse_cache_file()
+        if cache_file.exists():
+            with cache_file.open("rb") as file_:
+                return pickle.load(file_)
+
+        parsed = self.parse()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_file.open("wb") as file_:
+            pickle.dump(parsed, file_, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        return parsed
+
+    def _parse_cache_file(self) -> Path:
+        """Location of pickled parse result."""
+        cls_ = type(self)
+        if cls_.__module__.split(".")[0] == __package__:
+            source = source_digest(cls_.__module__).encode("ascii")
+        else:
+            source = Path(inspect.getsourcefile(cls_)).read_bytes()
+        key = text_digest(source + b"\0" + self.input_text.encode("utf-8"))
+        name = f"{cls_.__module__}.{cls_.__qualname__}-{key[:32]}.pickle"
+        return _get_cache_root() / "parsed" / name
+
     @abstractmethod
     def part1(self) -> str | int:
         """Returns puzzle solution to part 1."""
@@ -0,0 +1,160 @@
+"""Benchmarking of puzzle solutions."""
+
+import inspect
+import json
+import math
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .base import Puzzle
+
+
+@dataclass
+class TimingStats:
+
+    """Wall time samples of one benchmarked phase, in seconds."""
+
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def min(self) -> float:
+        """Fastest sample."""
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        """Median of samples."""
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        """95th percentile of samples, nearest-rank method."""
+        ordered = sorted(self.samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation, zero for a single sample."""
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def to_dict(self) -> dict:
+        """Statistics and raw samples as a JSON-serializable dictionary."""
+        return {
+            "min": self.min,
+            "median": self.median,
+            "p95": self.p95,
+            "stddev": self.stddev,
+            "samples": self.samples,
+        }
+
+
+def puzzle_kwargs(puzzle_cls: type[Puzzle], options: dict[str, str]) -> dict:
+    """Keyword arguments of the puzzle class from option strings.
+
+    Values are converted to the type of the default value of the argument,
+    if that is a bool, int or float, and passed as strings otherwise.
+
+    Raises:
+        ValueError: Unknown argument, or value not of the expected type.
+    """
+    params = dict(inspect.signature(puzzle_cls.__init__).parameters)
+    for name in ("self", "input_text"):
+        params.pop(name, None)
+    kwargs = {}
+    for key, value in options.items():
+        if key not in params:
+            raise ValueError(
+                f"{puzzle_cls.__name__} has no argument {key!r}, "
+                f"expected one of {sorted(params)}"
+            )
+        default = params[key].default
+        if isinstance(default, bool):
+            if value.lower() not in ("true", "false", "1", "0", "yes", "no"):
+                raise ValueError(f"{key}={value}: expected a boolean")
+            kwargs[key] = value.lower() in ("true", "1", "yes")
+        elif isinstance(default, (int, float)):
+            try:
+                kwargs[key] = type(default)(value)
+            except ValueError as err:
+                raise ValueError(
+                    f"{key}={value}: expected {type(default).__name__}"
+                ) from err
+        else:
+            kwargs[key] = value
+    return kwargs
+
+
+def time_puzzle(
+    puzzle_cls: type[Puzzle],
+    input_text: str,
+    part: int,
+    repeat=5,
+    warmup=1,
+    options: dict | None = None,
+) -> dict[str, TimingStats]:
+    """Time parsing and solving of one puzzle part.
+
+    Each round constructs a new puzzle instance, as solutions may modify
+    their state while solving. Construction and `Puzzle.parsed` (the parse
+    phase) and solving are timed separately.
+
+    Args:
+        puzzle_cls: Puzzle class to be benchmarked.
+        input_text: Puzzle input.
+        part: Puzzle part, 1 or 2.
+        repeat: Number of timed rounds.
+        warmup: Number of untimed rounds before the timed ones.
+        options: Keyword arguments of the puzzle class, such as an engine.
+
+    Returns:
+        Timings with keys 'parse' and 'solve'.
+    """
+    timings = {"parse": TimingStats(), "solve": TimingStats()}
+    for round_ in range(warmup + repeat):
+        t_0 = time.perf_counter()
+        puzzle = puzzle_cls(input_text, **(options or {}))
+        _ = puzzle.parsed
+        t_1 = time.perf_counter()
+        _ = puzzle.part1() if part == 1 else puzzle.part2()
+        t_2 = time.perf_counter()
+
+        if round_ >= warmup:
+            timings["parse"].samples.append(t_1 - t_0)
+            timings["solve"].samples.append(t_2 - t_1)
+    return timings
+
+
+def format_timings(timings: dict[str, TimingStats]) -> str:
+    """Format timing statistics as text table, times in milliseconds."""
+    lines = [f"{'phase':<8}{'min':>12}{'median':>12}{'p95':>12}{'stddev':>12}"]
+    for phase, stats in timings.items():
+        values = [stats.min, stats.median, stats.p95, stats.stddev]
+        lines.append(f"{phase:<8}" + "".join(f"{v * 1000:>12.3f}" for v in values))
+    return "\n".join(lines)
+
+
+def bench_record(
+    year: int, day: int, part: int, timings: dict[str, TimingStats], **extra
+) -> dict:
+    """Machine-readable benchmark record of one puzzle part."""
+    return {
+        "year": year,
+        "day": day,
+        "part": part,
+        "python": platform.python_version(),
+        "timings": {phase: stats.to_dict() for phase, stats in timings.items()},
+        **extra,
+    }
+
+
+def load_budgets(path: Path) -> dict[str, float]:
+    """Read per-puzzle time budgets, in seconds.
+
+    The file is a JSON object with 'year/day/part' keys, for example
+    {"2023/17/1": 2.5}. The budget is compared to the sum of median
+    parsing and solving times.
+    """
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -0,0 +1,60 @@
+"""Synthetic puzzle inputs of arbitrary size.
+
+Generators are functions `(rng, scale) -> Iterator[str]`, which yield the
+lines of one puzzle input without line endings. Scale 1 produces inputs
+about the size of the personal puzzle inputs; sizes grow roughly linearly
+with scale in the number of lines, or in the side of a grid.
+
+Generators of a year are listed in `GENERATORS` of module `y{year - 2000}`
+by day, and only imported when needed.
+"""
+
+import importlib
+import random
+from collections.abc import Iterator
+from typing import TextIO
+
+
+def generate(year: int, day: int, scale=1.0, seed=0) -> Iterator[str]:
+    """Generate lines of a synthetic input, seeded for reproducibility.
+
+    Raises:
+        ValueError: There is no generator for the year and day.
+    """
+    try:
+        module = importlib.import_module(f".y{year - 2000}", __package__)
+        generator = module.GENERATORS[day]
+    except (ModuleNotFoundError, KeyError) as err:
+        raise ValueError(f"No input generator for {year}/{day}") from err
+    return generator(random.Random(seed), scale)
+
+
+def write_input(
+    file_: TextIO, year: int, day: int, scale=1.0, seed=0, batch_size=1024
+) -> int:
+    """Write synthetic input to a file as it is generated.
+
+    Returns:
+        Number of lines written.
+    """
+    n_lines = 0
+    batch = []
+    for line in generate(year, day, scale=scale, seed=seed):
+        batch.append(line)
+        if len(batch) == batch_size:
+            file_.write("\n".join(batch) + "\n")
+            n_lines += len(batch)
+            batch.clear()
+    if batch:
+        file_.write("\n".join(batch) + "\n")
+        n_lines += len(batch)
+    return n_lines
+
+
+def available(year: int) -> list[int]:
+    """Days of the year, for which there is an input generator."""
+    try:
+        module = importlib.import_module(f".y{year - 2000}", __package__)
+    except ModuleNotFoundError:
+        return []
+    return sorted(module.GENERATORS)
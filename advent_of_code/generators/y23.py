@@ -0,0 +1,401 @@
+"""Input generators for the 2023 puzzles.
+
+Generated inputs follow the structure of the personal puzzle inputs, which
+the solutions may rely on, e.g. the hidden binary counters of day 20.
+"""
+
+import math
+import random
+from collections.abc import Iterator
+from string import ascii_lowercase
+
+
+def _size(base: int, scale: float, minimum: int) -> int:
+    return max(minimum, round(base * scale))
+
+
+def _names(rng: random.Random, count: int, exclude=()) -> list[str]:
+    """Unique random lowercase names, as short as possible."""
+    length = 2
+    while 26**length < 2 * (count + len(exclude)):
+        length += 1
+    names = []
+    for code in rng.sample(range(26**length), count + len(exclude)):
+        name = ""
+        for _ in range(length):
+            code, rem = divmod(code, 26)
+            name += ascii_lowercase[rem]
+        if name not in exclude:
+            names.append(name)
+    return names[:count]
+
+
+def _is_prime(num: int) -> bool:
+    return num > 1 and all(num % i for i in range(2, math.isqrt(num) + 1))
+
+
+def _char_grid(
+    rng: random.Random, size: int, chars: str, weights: tuple[int, ...]
+) -> Iterator[str]:
+    for _ in range(size):
+        yield "".join(rng.choices(chars, weights=weights, k=size))
+
+
+def almanac(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 5: seed ranges, and maps that permute blocks of numbers."""
+    categories = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    limit = 1 << 32
+    seeds = []
+    for _ in range(_size(10, scale, 1)):
+        seeds += [rng.randrange(1, limit // 2), rng.randrange(1, limit // 16)]
+    yield "seeds: " + " ".join(map(str, seeds))
+
+    # Numbers start from 1, as the solution treats destination 0 as unmapped
+    n_rows = _size(30, scale, 2)
+    for source, dest in zip(categories, categories[1:]):
+        yield ""
+        yield f"{source}-to-{dest} map:"
+        bounds = [1] + sorted(rng.sample(range(2, limit), n_rows - 1)) + [limit]
+        dest_start = 1
+        for i in rng.sample(range(n_rows), n_rows):
+            length = bounds[i + 1] - bounds[i]
+            yield f"{dest_start} {bounds[i]} {length}"
+            dest_start += length
+
+
+def camel_cards(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 7: hands of five cards, unique if there are few enough, and bids."""
+    n_hands = _size(1000, scale, 1)
+    unique = n_hands <= 13**5 // 2
+    seen = set()
+    for _ in range(n_hands):
+        hand = "".join(rng.choices("23456789TJQKA", k=5))
+        while unique and hand in seen:
+            hand = "".join(rng.choices("23456789TJQKA", k=5))
+        if unique:
+            seen.add(hand)
+        yield f"{hand} {rng.randint(1, 1000)}"
+
+
+_N, _E, _S, _W = 1, 2, 4, 8
+_pipes = {
+    _N | _S: "|",
+    _E | _W: "-",
+    _N | _E: "L",
+    _N | _W: "J",
+    _S | _W: "7",
+    _S | _E: "F",
+}
+
+
+def _spanning_tree(rng: random.Random, height: int, width: int):
+    """Random spanning tree of a grid, by the growing tree algorithm.
+
+    Yields:
+        Edges ((y, x), (y, x + 1)) or ((y, x), (y + 1, x)).
+    """
+    visited = bytearray(height * width)
+    visited[0] = 1
+    active = [(0, 0)]
+    while active:
+        idx = rng.randrange(len(active))
+        y, x = active[idx]
+        options = [
+            (y + dy, x + dx)
+            for dy, dx in ((0, 1), (1, 0), (0, -1), (-1, 0))
+            if 0 <= y + dy < height
+            and 0 <= x + dx < width
+            and not visited[(y + dy) * width + x + dx]
+        ]
+        if not options:
+            active[idx] = active[-1]
+            active.pop()
+            continue
+        new = rng.choice(options)
+        visited[new[0] * width + new[1]] = 1
+        active.append(new)
+        yield min((y, x), new), max((y, x), new)
+
+
+def pipe_maze(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 10: one winding pipe loop among pieces of junk pipe.
+
+    The loop goes around a random spanning tree of a grid of n x n blocks,
+    so it is 8 n^2 tiles long and encloses 4 n^2 - 3 tiles.
+    """
+    blocks = _size(35, scale, 2)
+    side = 2 * blocks
+    links = bytearray(side * side)
+
+    # Loop around each block alone, then join loops of neighbouring blocks
+    for by in range(blocks):
+        for bx in range(blocks):
+            top, bottom = 2 * by * side + 2 * bx, (2 * by + 1) * side + 2 * bx
+            links[top] |= _E | _S
+            links[top + 1] |= _W | _S
+            links[bottom] |= _N | _E
+            links[bottom + 1] |= _N | _W
+    for (y0, x0), (y1, x1) in _spanning_tree(rng, blocks, blocks):
+        top, bottom = 2 * y0 * side + 2 * x0, (2 * y0 + 1) * side + 2 * x0
+        if y1 == y0:
+            links[top + 1] ^= _S | _E
+            links[bottom + 1] ^= _N | _E
+            links[top + 2] ^= _S | _W
+            links[bottom + 2] ^= _N | _W
+        else:
+            links[bottom] ^= _E | _S
+            links[bottom + 1] ^= _W | _S
+            links[bottom + side] ^= _E | _N
+            links[bottom + side + 1] ^= _W | _N
+
+    # Loop tiles at odd coordinates, straight pipes between them
+    size = 2 * side + 1
+    junk = rng.choices(".|-LJ7F", weights=(4, 1, 1, 1, 1, 1, 1), k=size * size)
+    rows = [junk[i * size : (i + 1) * size] for i in range(size)]
+    for idx, link in enumerate(links):
+        y, x = 2 * (idx // side) + 1, 2 * (idx % side) + 1
+        rows[y][x] = _pipes[link]
+        if link & _E:
+            rows[y][x + 1] = "-"
+        if link & _S:
+            rows[y + 1][x] = "|"
+
+    # Start tile must not look connected to anything but the loop
+    idx = rng.randrange(len(links))
+    y, x = 2 * (idx // side) + 1, 2 * (idx % side) + 1
+    rows[y][x] = "S"
+    for bit, dy, dx in ((_N, -1, 0), (_E, 0, 1), (_S, 1, 0), (_W, 0, -1)):
+        if not links[idx] & bit:
+            rows[y + dy][x + dx] = "."
+
+    for row in rows:
+        yield "".join(row)
+
+
+def parabolic_reflector_dish(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 14: rounded rocks O and cube rocks # on a square platform."""
+    yield from _char_grid(rng, _size(100, scale, 3), "O#.", (20, 15, 65))
+
+
+def contraption(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 16: mirrors and splitters, sparse on a square grid."""
+    yield from _char_grid(rng, _size(110, scale, 3), ".|-/\\", (88, 3, 3, 3, 3))
+
+
+def heat_loss_map(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 17: square grid of heat loss digits."""
+    yield from _char_grid(rng, _size(141, scale, 3), "123456789", (1,) * 9)
+
+
+def module_network(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 20: 12-bit binary counters, which reset at distinct primes.
+
+    Each counter is a chain of flip-flops, and resets via a conjunction
+    that gets a high pulse from the flip-flops of 1 bits of its period.
+    Module rx gets a low pulse, once all counters reset on the same press,
+    i.e. after the product of the periods.
+    """
+    n_bits = 12
+    n_chains = _size(4, scale, 1)
+    primes = [p for p in range(2 ** (n_bits - 1) + 1, 2**n_bits, 2) if _is_prime(p)]
+    periods = rng.sample(primes, n_chains)
+    names = iter(_names(rng, n_chains * (n_bits + 2) + 1, exclude=("rx",)))
+
+    final = next(names)
+    lines = [f"&{final} -> rx"]
+    firsts = []
+    for period in periods:
+        flip_flops = [next(names) for _ in range(n_bits)]
+        hub, inverter = next(names), next(names)
+        firsts.append(flip_flops[0])
+        hub_dests = [flip_flops[0], inverter]
+        for i, name in enumerate(flip_flops):
+            dests = flip_flops[i + 1 : i + 2]
+            if period >> i & 1:
+                dests.append(hub)
+            elif i > 0:
+                hub_dests.append(name)
+            rng.shuffle(dests)
+            lines.append(f"%{name} -> {', '.join(dests)}")
+        rng.shuffle(hub_dests)
+        lines.append(f"&{hub} -> {', '.join(hub_dests)}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"broadcaster -> {', '.join(firsts)}")
+
+    rng.shuffle(lines)
+    yield from lines
+
+
+def garden(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 21: odd-sized square of rocks, start in the middle.
+
+    The middle row and column, and the border are free of rocks.
+    """
+    size = _size(131, scale, 5) | 1
+    middle = size // 2
+    for y in range(size):
+        if y in (0, middle, size - 1):
+            row = ["."] * size
+        else:
+            row = rng.choices(".#", weights=(85, 15), k=size)
+            row[0] = row[middle] = row[-1] = "."
+        if y == middle:
+            row[middle] = "S"
+        yield "".join(row)
+
+
+def brick_stack(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 22: bricks of up to five cubes, floating above each other."""
+    side = _size(10 * math.sqrt(scale), 1, 3)
+    tops: dict[tuple[int, int], int] = {}
+    for _ in range(_size(1200, scale, 1)):
+        extent = [0, 0, 0]
+        extent[rng.randrange(3)] = rng.randint(0, min(4, side - 1))
+        x_0 = rng.randrange(side - extent[0])
+        y_0 = rng.randrange(side - extent[1])
+        cells = [
+            (x, y)
+            for x in range(x_0, x_0 + extent[0] + 1)
+            for y in range(y_0, y_0 + extent[1] + 1)
+        ]
+        z_0 = max(tops.get(cell, 0) for cell in cells) + 1 + rng.randrange(3)
+        z_1 = z_0 + extent[2]
+        for cell in cells:
+            tops[cell] = z_1
+        yield f"{x_0},{y_0},{z_0}~{x_0 + extent[0]},{y_0 + extent[1]},{z_1}"
+
+
+def hiking_trails(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 23: trails between junctions on a jittered n x n lattice.
+
+    Trails go right or down from each junction, with slopes next to the
+    junctions. The start trail leads to the top left junction, and the end
+    trail from the bottom right one.
+    """
+    n_junctions = _size(6, scale, 2)
+    spacing, jitter = 22, 4
+    offset = jitter + 4
+    span = offset + (n_junctions - 1) * spacing + jitter
+    height, width = span + 4, span + offset
+    rows = [["#"] * width for _ in range(height)]
+    junctions = [
+        [
+            (
+                offset + i * spacing + rng.randint(-jitter, jitter),
+                offset + j * spacing + rng.randint(-jitter, jitter),
+            )
+            for j in range(n_junctions)
+        ]
+        for i in range(n_junctions)
+    ]
+
+    def dig(y_0, x_0, y_1, x_1):
+        for y in range(min(y_0, y_1), max(y_0, y_1) + 1):
+            for x in range(min(x_0, x_1), max(x_0, x_1) + 1):
+                rows[y][x] = "."
+
+    for i in range(n_junctions):
+        for j in range(n_junctions):
+            y_a, x_a = junctions[i][j]
+            if j + 1 < n_junctions:
+                y_b, x_b = junctions[i][j + 1]
+                x_m = (x_a + x_b) // 2
+                dig(y_a, x_a, y_a, x_m)
+                dig(y_a, x_m, y_b, x_m)
+                dig(y_b, x_m, y_b, x_b)
+                rows[y_a][x_a + 1] = rows[y_b][x_b - 1] = ">"
+            if i + 1 < n_junctions:
+                y_b, x_b = junctions[i + 1][j]
+                y_m = (y_a + y_b) // 2
+                dig(y_a, x_a, y_m, x_a)
+                dig(y_m, x_a, y_m, x_b)
+                dig(y_m, x_b, y_b, x_b)
+                rows[y_a + 1][x_a] = rows[y_b - 1][x_b] = "v"
+
+    y_a, x_a = junctions[0][0]
+    dig(0, x_a, y_a, x_a)
+    rows[y_a - 1][x_a] = "v"
+    y_b, x_b = junctions[-1][-1]
+    dig(y_b, x_b, height - 1, x_b)
+    rows[y_b + 1][x_b] = "v"
+
+    for row in rows:
+        yield "".join(row)
+
+
+def hailstones(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 24: hailstones that all collide with one rock thrown.
+
+    The rock starts from integer coordinates with integer velocity, and
+    hits each hailstone at a distinct integer time.
+    """
+    rock_pos = [rng.randrange(10**14, 4 * 10**14) for _ in range(3)]
+    rock_vel = [rng.randint(-250, 250) for _ in range(3)]
+    n_stones = _size(300, scale, 3)
+    for time in rng.sample(range(10**11, 10**12), n_stones):
+        vel = [0, 0, 0]
+        while not (vel[0] and vel[1]) or vel == rock_vel:
+            vel = [rng.randint(-300, 300) for _ in range(3)]
+        pos = [p + (v_r - v) * time for p, v_r, v in zip(rock_pos, rock_vel, vel)]
+        yield "{}, {}, {} @ {}, {}, {}".format(*pos, *vel)
+
+
+def wiring_diagram(rng: random.Random, scale: float) -> Iterator[str]:
+    """Day 25: two random graphs joined by three wires.
+
+    Every component has at least four wires within its own group, so the
+    three wires between the groups are the only minimum cut.
+    """
+    n_nodes = _size(1500, scale, 10)
+    names = _names(rng, n_nodes)
+    n_first = rng.randint(max(5, n_nodes * 2 // 5), min(n_nodes - 5, n_nodes * 3 // 5))
+    groups = [list(range(n_first)), list(range(n_first, n_nodes))]
+
+    edges = set()
+    degree = [0] * n_nodes
+    for group in groups:
+        for node in group:
+            while degree[node] < 4:
+                other = rng.choice(group)
+                edge = (min(node, other), max(node, other))
+                if other == node or edge in edges:
+                    continue
+                edges.add(edge)
+                degree[node] += 1
+                degree[other] += 1
+    cut = set()
+    while len(cut) < 3:
+        cut.add((rng.choice(groups[0]), rng.choice(groups[1])))
+    edges |= cut
+
+    wires: dict[int, list[int]] = {}
+    for edge in sorted(edges):
+        node, other = edge if rng.random() < 0.5 else edge[::-1]
+        wires.setdefault(node, []).append(other)
+    for node in rng.sample(sorted(wires), len(wires)):
+        yield f"{names[node]}: {' '.join(names[n] for n in wires[node])}"
+
+
+GENERATORS = {
+    5: almanac,
+    7: camel_cards,
+    10: pipe_maze,
+    14: parabolic_reflector_dish,
+    16: contraption,
+    17: heat_loss_map,
+    20: module_network,
+    21: garden,
+    22: brick_stack,
+    23: hiking_trails,
+    24: hailstones,
+    25: wiring_diagram,
+}
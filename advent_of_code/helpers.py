@@ -1,16 +1,147 @@
-"""Helper functions for Advent of Code."""
+"""Helper functions for Advent of Code.
 
+Numpy is imported only in the functions that need it, so that solutions
+using only the pure-Python helpers start fast.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
 import itertools
+import numbers
 import re
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Hashable, Iterable, Sequence
+from dataclasses import dataclass
 from enum import Enum
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass
+class CycleInfo:
+
+    """Cycle detected in a sequence of states.
+
+    Attrs:
+        preamble: Number of cycles run before the first repeating state.
+        period: Number of cycles, after which states repeat.
+    """
+
+    preamble: int
+    period: int
+
+    def reduce(self, n_cycles: int) -> int:
+        """Earliest number of cycles that leads to the same state."""
+        if n_cycles < self.preamble:
+            return n_cycles
+        return self.preamble + (n_cycles - self.preamble) % self.period
+
 
-import numpy as np
+class PrefixSums:
+
+    """Running sums of a sequence of numbers, for range sums in O(1).
+
+    Sums are kept in a numpy array of int64, float64 or complex128, while
+    all values are of the matching type and integer sums fit into int64.
+    Otherwise the array falls back to Python objects, so that sums are
+    those of plain Python arithmetic, exact for integers of any size.
+    """
+
+    def __init__(self, capacity=1024) -> None:
+        self._capacity = capacity
+        self._sums: np.ndarray | None = None
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @staticmethod
+    def _fits(dtype, value, total) -> bool:
+        """Whether value and running total can be kept in array of dtype."""
+        if dtype.kind == "i":
+            return isinstance(value, int) and -(2**63) <= total < 2**63
+        if dtype.kind == "f":
+            return isinstance(value, float)
+        if dtype.kind == "c":
+            return isinstance(value, complex)
+        return True
+
+    def append(self, value: int | float | complex):
+        """Add value to the end of the sequence."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if isinstance(value, numbers.Integral):
+            value = int(value)
+        if self._sums is None:
+            for dtype in (np.int64, np.float64, np.complex128, object):
+                if self._fits(np.dtype(dtype), value, value):
+                    break
+            self._sums = np.zeros(self._capacity + 1, dtype=dtype)
+        elif self._len + 1 == len(self._sums):
+            self._sums.resize(2 * len(self._sums), refcheck=False)
+        total = self._sums.item(self._len) + value
+        if not self._fits(self._sums.dtype, value, total):
+            self._sums = self._sums.astype(object)
+        self._sums[self._len + 1] = total
+        self._len += 1
+
+    def total(self, start=0, stop: int | None = None):
+        """Sum of values from index start to stop - 1."""
+        stop = self._len if stop is None else stop
+        if not 0 <= start <= stop <= self._len:
+            raise IndexError(f"Range {start}:{stop} out of 0:{self._len}")
+        if self._sums is None:
+            return 0
+        return self._sums.item(stop) - self._sums.item(start)
+
+
+class FingerprintCollision(Exception):
+    """Different states of a ResultCycler have the same fingerprint."""
+
+
+def state_digest(state: bytes | str | np.ndarray) -> bytes:
+    """128-bit BLAKE2b digest of a compact state, e.g. for `fingerprint`.
+
+    Arrays are digested with their shape and data type.
+    """
+    hash_ = hashlib.blake2b(digest_size=16)
+    if isinstance(state, str):
+        state = state.encode("utf-8")
+    elif hasattr(state, "tobytes"):
+        hash_.update(f"{state.shape}{state.dtype}".encode())
+        state = state.tobytes()
+    hash_.update(state)
+    return hash_.digest()
 
 
 class ResultCycler(ABC):
+
+    """Sequence of states that eventually repeats, e.g. a simulation.
+
+    Results after any number of cycles are found by detecting the cycle of
+    states, which are identified by their `fingerprint`.
+
+    Attrs:
+        cycle_method: How to detect the cycle. 'index' stores the fingerprint
+          and result of every state until one repeats. 'brent' and 'floyd'
+          use constant memory, but run more cycles on copies of the state,
+          leaving this state unchanged.
+        verify_cycle: Compare full states by `cycle_state`, when their
+          fingerprints match.
+        cycle_info: Cycle detected by the latest `find_result_after`.
+    """
+
+    cycle_method = "index"
+    verify_cycle = False
+    cycle_info: CycleInfo | None = None
+    _prefix_sums: PrefixSums | None = None
+    _replay_state: "ResultCycler | None" = None
+    _n_results = 0
+
     @abstractmethod
     def get_result(self):
         raise NotImplementedError
@@ -19,43 +150,222 @@ class ResultCycler(ABC):
     def run_cycle(self):
         raise NotImplementedError
 
-    def find_result_after(self, n_cycles: int, cumulative=False):
-        hashes = []
-        results = []
-        base_cycles = 0
-        cycle_modulo = 0
-
-        i = 0
-        while not cycle_modulo:
-            hash_ = hash(self)
-            if i == n_cycles:
-                return self.get_result() + (sum(results) if cumulative else 0)
-            if hash_ in hashes:
-                print(hashes)
-                print(i, hash_, self.get_result())
-                base_cycles = hashes.index(hash_)
-                cycle_modulo = len(hashes) - base_cycles
+    def fingerprint(self) -> Hashable:
+        """Identifier of the current state, `hash(self)` by default.
+
+        Override with e.g. `state_digest` of a compact state, if the hash
+        is slow to compute or prone to collisions.
+        """
+        return hash(self)
+
+    def cycle_state(self):
+        """Full current state, compared when verifying fingerprint matches."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement cycle_state()"
+        )
+
+    def find_result_after(
+        self, n_cycles: int, cumulative=False, method=None, verify=None
+    ):
+        """Result after running some number of cycles.
+
+        Cycle detection stops after n_cycles, and the result is then
+        simulated directly, with `cycle_info` None.
+
+        Args:
+            n_cycles: Number of cycles, may be a float like 1e9.
+            cumulative: Return sum of the results of the initial state and
+              of all cycles, instead.
+            method: Cycle detection method, default `cycle_method`.
+            verify: Verify matching fingerprints, default `verify_cycle`.
+
+        Raises:
+            FingerprintCollision: Verification found different states with
+              the same fingerprint.
+        """
+        n_cycles = int(n_cycles)
+        method = method or self.cycle_method
+        verify = self.verify_cycle if verify is None else verify
+        if method == "index":
+            self._replay_state = None
+            return self._find_by_index(n_cycles, cumulative, verify)
+        if method in ("brent", "floyd"):
+            initial = copy.deepcopy(self)
+            detect = self._detect_brent if method == "brent" else self._detect_floyd
+            self.cycle_info = detect(initial, verify, n_cycles)
+            return self._replay(initial, n_cycles, cumulative)
+        raise ValueError(f"Unknown cycle detection method {method!r}")
+
+    @staticmethod
+    def _same(state: "ResultCycler", other: "ResultCycler", verify: bool) -> bool:
+        if state.fingerprint() != other.fingerprint():
+            return False
+        if verify and state.cycle_state() != other.cycle_state():
+            raise FingerprintCollision(f"Fingerprint {state.fingerprint()!r}")
+        return True
+
+    def _find_by_index(self, n_cycles: int, cumulative: bool, verify: bool):
+        initial = copy.deepcopy(self) if verify else None
+        index: dict[Hashable, int] = {}
+        results = PrefixSums() if cumulative else []
+        for i in range(n_cycles + 1):
+            fingerprint = self.fingerprint()
+            if fingerprint in index:
                 break
+            index[fingerprint] = i
             results.append(self.get_result())
-            hashes.append(hash_)
-
-            self.run_cycle()
-            i += 1
-
-        base_offset = (n_cycles - base_cycles) % cycle_modulo
-        n_repeats = (n_cycles - base_cycles) // cycle_modulo
-        idx = int(base_offset + base_cycles)
-
-        print(results, base_cycles, n_repeats, idx)
-
-        if cumulative:
-            return (
-                sum(results[:base_cycles])
-                + n_repeats * sum(results[base_cycles:])
-                + sum(results[base_cycles : idx + 1])
-            )
-
-        return results[idx]
+            if i < n_cycles:
+                self.run_cycle()
+        else:
+            self.cycle_info = None
+            if cumulative:
+                self._prefix_sums = results
+                self._n_results = len(results)
+                return results.total()
+            return results[-1]
+
+        preamble = index[fingerprint]
+        if verify:
+            self._same(self._advanced(initial, preamble), self, verify)
+        self.cycle_info = CycleInfo(preamble=preamble, period=i - preamble)
+        if not cumulative:
+            return results[self.cycle_info.reduce(n_cycles)]
+        self._prefix_sums = results
+        self._n_results = len(results)
+        return self.cumulative_between(0, n_cycles + 1)
+
+    def cumulative_between(self, start: int, stop: int):
+        """Sum of results of the states after `start` to `stop - 1` cycles.
+
+        Takes constant time for any range, once the cycle is detected by
+        `find_result_after` with `cumulative=True` and method 'index'.
+        Methods 'brent' and 'floyd' replay at most preamble and period
+        cycles from the initial state instead.
+
+        Raises:
+            ValueError: Range extends beyond the cycles run, and no cycle
+              was detected.
+        """
+        if self._prefix_sums is None and self._replay_state is None:
+            raise ValueError("Run find_result_after(..., cumulative=True) first")
+        before_stop, before_start = self._sums_before(stop, start)
+        return before_stop - before_start
+
+    def _sums_before(self, *stops: int) -> list:
+        """Sums of results of the first n states, for each n in stops.
+
+        Counts beyond the cycle are reduced to sums of the first states up
+        to preamble + period, which are found in one pass.
+        """
+        info = self.cycle_info
+        terms = []
+        for n_states in stops:
+            if info is None or n_states <= info.preamble + info.period:
+                terms.append([(1, n_states)])
+            else:
+                n_repeats, rem = divmod(n_states - info.preamble, info.period)
+                terms.append(
+                    [
+                        (1, info.preamble + rem),
+                        (n_repeats, info.preamble + info.period),
+                        (-n_repeats, info.preamble),
+                    ]
+                )
+        needed = {n_states for term in terms for _, n_states in term}
+        if max(needed) > self._n_results and info is None:
+            raise ValueError(f"No results beyond {self._n_results} cycles")
+
+        if self._prefix_sums is not None:
+            partial = {n: self._prefix_sums.total(0, n) for n in needed}
+        else:
+            partial = {}
+            state = copy.deepcopy(self._replay_state)
+            total = 0
+            for i in range(max(needed) + 1):
+                if i in needed:
+                    partial[i] = total
+                if i < max(needed):
+                    total += state.get_result()
+                    state.run_cycle()
+        return [sum(coef * partial[n] for coef, n in term) for term in terms]
+
+    @staticmethod
+    def _advanced(state: "ResultCycler", n_cycles=1) -> "ResultCycler":
+        for _ in range(n_cycles):
+            state.run_cycle()
+        return state
+
+    def _detect_brent(
+        self, initial: "ResultCycler", verify: bool, limit: int
+    ) -> CycleInfo | None:
+        """Brent's cycle detection, None if not found within limit cycles."""
+        power = period = n_steps = 1
+        tortoise = copy.deepcopy(initial)
+        hare = self._advanced(copy.deepcopy(initial))
+        while not self._same(tortoise, hare, verify):
+            if n_steps >= limit:
+                return None
+            if power == period:
+                tortoise = copy.deepcopy(hare)
+                power *= 2
+                period = 0
+            hare.run_cycle()
+            period += 1
+            n_steps += 1
+
+        tortoise = copy.deepcopy(initial)
+        hare = self._advanced(copy.deepcopy(initial), period)
+        preamble = 0
+        while not self._same(tortoise, hare, verify):
+            tortoise.run_cycle()
+            hare.run_cycle()
+            preamble += 1
+        return CycleInfo(preamble=preamble, period=period)
+
+    def _detect_floyd(
+        self, initial: "ResultCycler", verify: bool, limit: int
+    ) -> CycleInfo | None:
+        """Floyd's cycle detection, None if not found within limit cycles."""
+        tortoise = self._advanced(copy.deepcopy(initial))
+        hare = self._advanced(copy.deepcopy(initial), 2)
+        n_steps = 1
+        while not self._same(tortoise, hare, verify):
+            if n_steps >= limit:
+                return None
+            tortoise.run_cycle()
+            hare.run_cycle()
+            hare.run_cycle()
+            n_steps += 1
+
+        tortoise = copy.deepcopy(initial)
+        preamble = 0
+        while not self._same(tortoise, hare, verify):
+            tortoise.run_cycle()
+            hare.run_cycle()
+            preamble += 1
+
+        hare = self._advanced(copy.deepcopy(tortoise))
+        period = 1
+        while not self._same(tortoise, hare, verify):
+            hare.run_cycle()
+            period += 1
+        return CycleInfo(preamble=preamble, period=period)
+
+    def _replay(self, initial: "ResultCycler", n_cycles: int, cumulative: bool):
+        """Result after cycles, replayed from initial state, within one period.
+
+        Without a detected cycle, all n_cycles are run. Cumulative results
+        keep only running sums, see `_sums_before`.
+        """
+        if not cumulative:
+            if self.cycle_info is not None:
+                n_cycles = self.cycle_info.reduce(n_cycles)
+            return self._advanced(initial, n_cycles).get_result()
+
+        self._prefix_sums = None
+        self._replay_state = initial
+        self._n_results = n_cycles + 1
+        return self._sums_before(n_cycles + 1)[0]
 
 
 class TermColour(Enum):
@@ -103,18 +413,44 @@ def highlight_by_pos(
     return ret
 
 
-def to_numpy_array(data: str, dtype="U") -> np.ndarray:
+def to_numpy_array(data: str | bytes, dtype="U") -> np.ndarray:
     """Read fixed-width text string to Numpy array.
 
     Args:
+        data: Text, or a bytes-like buffer such as `bytes` or `mmap`. Rows
+          of a buffer are viewed in place with dtype 'S', without copying.
         dtype: Numpy short data type, 'S' or 'U'
     """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if not isinstance(data, str):
+        arr = _buffer_to_char_array(data)
+        return arr if dtype == "S" else arr.astype(f"{dtype}1")
+
     nparr = np.array(data.split("\n"), dtype=dtype)
     return nparr.view(f"{dtype}1").reshape((nparr.size, -1))
 
 
+def _buffer_to_char_array(buffer) -> np.ndarray:
+    """View newline-separated fixed-width rows in a buffer as 'S1' array."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    length = len(buffer)
+    while length > 0 and buffer[length - 1 : length] == b"\n":
+        length -= 1
+    width = buffer.find(b"\n", 0, length)
+    if width < 0:
+        width = length
+    n_rows = (length + 1) // (width + 1) if length else 0
+    return np.ndarray(
+        (n_rows, width), dtype="S1", buffer=buffer, strides=(width + 1, 1)
+    )
+
+
 def char_array_to_string(arr: np.ndarray, encoding="utf-8") -> str:
     """Convert char array back to string."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
     col = np.full((arr.shape[0], 1), "\n", dtype=arr.dtype)
     return np.hstack((arr, col)).tobytes().decode(encoding).replace("\x00", "").strip()
 
@@ -160,6 +496,8 @@ def area_by_vertices(vertices: Iterable[int, int], boundary: int) -> float:
 
 def point_angles(a, b, c):
     """Calculate angle by points abc, where b is center point."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
     ba = a - b
     bc = c - b
 
@@ -169,6 +507,8 @@ def point_angles(a, b, c):
 
 def cosine_similarity(vec: np.ndarray, mat2: np.ndarray) -> np.ndarray:
     """Cosine similarity between vector and each column in mat1."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
     p1 = vec.dot(mat2)
     p2 = np.linalg.norm(mat2, axis=0) * np.linalg.norm(vec)
     return p1 / p2
@@ -190,6 +530,7 @@ def least_squares_transform(
         Function, with which to transform any points in source coordinates
         into target coordinates.
     """
+    import numpy as np  # pylint: disable=import-outside-toplevel
 
     def pad(x):
         """Add vector column of ones to the end."""
@@ -246,3 +587,65 @@ def partition_range(
     overlap = overlap_pts if (overlap_pts[0] < overlap_pts[1]) else None
 
     return before, overlap, after
+
+
+def strongly_connected_components(
+    successors: Sequence[Sequence[int]], roots: Iterable[int] | None = None
+) -> tuple[list[int], int]:
+    """Strongly connected components of a graph, by iterative Tarjan's algorithm.
+
+    Args:
+        successors: Successor nodes of each node, nodes are 0...n-1.
+        roots: Nodes, from which to search. Default: all nodes.
+
+    Returns:
+        Tuple (component of each node, number of components). Components
+        are numbered in reverse topological order, so that edges between
+        components go from higher numbers to lower ones. Nodes not
+        reachable from roots have component -1.
+    """
+    n_nodes = len(successors)
+    index = [-1] * n_nodes
+    low = [0] * n_nodes
+    on_stack = [False] * n_nodes
+    component = [-1] * n_nodes
+    stack = []
+    counter = 0
+    n_components = 0
+
+    for root in range(n_nodes) if roots is None else roots:
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            if i < len(successors[node]):
+                work[-1] = (node, i + 1)
+                succ = successors[node][i]
+                if index[succ] == -1:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    work.append((succ, 0))
+                elif on_stack[succ]:
+                    low[node] = min(low[node], index[succ])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = n_components
+                    if member == node:
+                        break
+                n_components += 1
+    return component, n_components
@@ -0,0 +1,245 @@
+"""Persistent history of solution timings, and detection of regressions.
+
+Timed runs are appended as JSON lines to `history.jsonl` in the cache
+root. Each record is keyed by git commit, Python version and a hash of
+the puzzle input, so that timings are only compared between runs on the
+same input and interpreter.
+"""
+
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .util import _get_cache_root
+
+
+def history_file() -> Path:
+    """Location of the timing history."""
+    return _get_cache_root() / "history.jsonl"
+
+
+def git_commit() -> tuple[str, bool]:
+    """Current git commit of the package source, and whether tree is dirty.
+
+    Returns ('unknown', False), if the source is not in a git repository.
+    """
+    cwd = Path(__file__).parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no", "--", "."],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+
+def make_record(
+    year: int,
+    day: int,
+    part: int,
+    samples: list[float],
+    input_hash: str,
+    commit: tuple[str, bool] | None = None,
+    **extra,
+) -> dict:
+    """Create history record of timed runs of one puzzle part.
+
+    Args:
+        samples: Wall times of parsing and solving, one per round.
+        input_hash: Digest of the puzzle input, see `util.text_digest`.
+        commit: Result of `git_commit()`, looked up if not given.
+        extra: Additional information to be stored.
+    """
+    commit_id, dirty = commit or git_commit()
+    return {
+        "timestamp": time.time(),
+        "commit": commit_id,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "input_hash": input_hash,
+        "year": year,
+        "day": day,
+        "part": part,
+        "samples": samples,
+        **extra,
+    }
+
+
+def append_records(records: Iterable[dict]):
+    """Append records to the history file."""
+    path = history_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as file_:
+        for record in records:
+            file_.write(json.dumps(record) + "\n")
+
+
+def load_records() -> list[dict]:
+    """Read all records from the history file, oldest first."""
+    path = history_file()
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as file_:
+        return [json.loads(line) for line in file_ if line.strip()]
+
+
+def _key(record: dict) -> str:
+    key = f"{record['year']}/{record['day']}/{record['part']}"
+    if options := record.get("options"):
+        key += " " + ",".join(f"{k}={v}" for k, v in sorted(options.items()))
+    return key
+
+
+def latest_durations(records: Iterable[dict]) -> dict[str, float]:
+    """Median wall time of the latest record of each puzzle part."""
+    return {_key(r): statistics.median(r["samples"]) for r in records}
+
+
+@dataclass
+class Comparison:
+
+    """Timing comparison of one puzzle part between two commits.
+
+    Attrs:
+        ratio: Median time on head commit, relative to base commit.
+        p_value: One-sided probability of head samples being as slow as
+          observed, if there was no difference to base.
+    """
+
+    key: str
+    base: str
+    head: str
+    base_median: float
+    head_median: float
+    ratio: float
+    p_value: float
+    slower: bool
+
+
+def mann_whitney_p(base: list[float], head: list[float]) -> float:
+    """One-sided Mann-Whitney U test, whether head tends to be greater.
+
+    Uses normal approximation with tie correction, which is adequate from
+    about five samples per group.
+    """
+    n_1, n_2 = len(base), len(head)
+    combined = sorted((v, i) for i, v in enumerate(base + head))
+
+    # Average ranks for ties
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[combined[k][1]] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    u_head = sum(ranks[n_1:]) - n_2 * (n_2 + 1) / 2
+    mean = n_1 * n_2 / 2
+    n_tot = n_1 + n_2
+    var = n_1 * n_2 / 12 * ((n_tot + 1) - tie_term / (n_tot * (n_tot - 1)))
+    if var <= 0:
+        return 1.0
+    z = (u_head - mean - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(
+    records: list[dict],
+    head: str,
+    base: str | None = None,
+    alpha=0.05,
+    threshold=0.05,
+) -> list[Comparison]:
+    """Compare timings of puzzle parts between two commits.
+
+    Only records with the same Python version and input as the latest head
+    record of each puzzle part are compared. Timings of `bench` and of
+    `run` are compared separately, and records from a dirty working tree
+    are left out, as their commit does not identify the timed code.
+
+    Args:
+        records: History records, oldest first.
+        head: Commit (or its prefix) to be checked for slowdowns.
+        base: Reference commit (or prefix). Default: the latest other
+          commit, which has comparable records.
+        alpha: Significance level.
+        threshold: Minimum relative slowdown of the median to be flagged.
+    """
+    by_key: dict[str, list[dict]] = {}
+    for rec in records:
+        if rec["dirty"]:
+            continue
+        key = _key(rec)
+        if source := rec.get("source"):
+            key += f" ({source})"
+        by_key.setdefault(key, []).append(rec)
+
+    comparisons = []
+    for key, key_records in sorted(by_key.items()):
+        head_records = [r for r in key_records if r["commit"].startswith(head)]
+        if not head_records:
+            continue
+        ref = head_records[-1]
+        comparable = [
+            r
+            for r in key_records
+            if r["python"] == ref["python"] and r["input_hash"] == ref["input_hash"]
+        ]
+        base_commit = base
+        if base_commit is None:
+            others = [r["commit"] for r in comparable if r["commit"] != ref["commit"]]
+            if not others:
+                continue
+            base_commit = others[-1]
+
+        head_samples = [
+            s for r in comparable if r["commit"] == ref["commit"] for s in r["samples"]
+        ]
+        base_samples = [
+            s
+            for r in comparable
+            if r["commit"].startswith(base_commit)
+            for s in r["samples"]
+        ]
+        if not base_samples:
+            continue
+
+        base_median = statistics.median(base_samples)
+        head_median = statistics.median(head_samples)
+        ratio = head_median / base_median if base_median > 0 else math.inf
+        p_value = mann_whitney_p(base_samples, head_samples)
+        comparisons.append(
+            Comparison(
+                key=key,
+                base=base_commit,
+                head=ref["commit"],
+                base_median=base_median,
+                head_median=head_median,
+                ratio=ratio,
+                p_value=p_value,
+                slower=p_value < alpha and ratio > 1 + threshold,
+            )
+        )
+    return comparisons
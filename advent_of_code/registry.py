@@ -0,0 +1,33 @@
+"""Index of implemented puzzles.
+
+Generated by `python -m advent_of_code index`, do not edit by hand.
+"""
+
+PUZZLES = {
+    (2021, 6): ("advent_of_code.y21.day06", "Lanternfish"),
+    (2021, 19): ("advent_of_code.y21.day19", "BeaconScanner"),
+    (2023, 1): ("advent_of_code.y23.day01", "Trebuchet"),
+    (2023, 2): ("advent_of_code.y23.day02", "CubeConundrum"),
+    (2023, 3): ("advent_of_code.y23.day03", "GearRatios"),
+    (2023, 4): ("advent_of_code.y23.day04", "ScratchCards"),
+    (2023, 5): ("advent_of_code.y23.day05", "Almanac"),
+    (2023, 6): ("advent_of_code.y23.day06", "WaitForIt"),
+    (2023, 7): ("advent_of_code.y23.day07", "CamelCards"),
+    (2023, 8): ("advent_of_code.y23.day08", "HauntedWasteland"),
+    (2023, 9): ("advent_of_code.y23.day09", "MirageMaintenance"),
+    (2023, 10): ("advent_of_code.y23.day10", "PipeMaze"),
+    (2023, 11): ("advent_of_code.y23.day11", "CosmicExpansion"),
+    (2023, 12): ("advent_of_code.y23.day12", "HotSprings"),
+    (2023, 13): ("advent_of_code.y23.day13", "PointOfIncidence"),
+    (2023, 14): ("advent_of_code.y23.day14", "ParabolicReflectorDish"),
+    (2023, 15): ("advent_of_code.y23.day15", "LensLibrary"),
+    (2023, 16): ("advent_of_code.y23.day16", "TheFloorWillBeLava"),
+    (2023, 17): ("advent_of_code.y23.day17", "ClumsyCrucible"),
+    (2023, 18): ("advent_of_code.y23.day18", "LavaductLagoon"),
+    (2023, 20): ("advent_of_code.y23.day20", "PulsePropagation"),
+    (2023, 21): ("advent_of_code.y23.day21", "StepCounter"),
+    (2023, 22): ("advent_of_code.y23.day22", "SandSlabs"),
+    (2023, 23): ("advent_of_code.y23.day23", "LongWalk"),
+    (2023, 24): ("advent_of_code.y23.day24", "NeverTellMeTheOdds"),
+    (2023, 25): ("advent_of_code.y23.day25", "Snowverload"),
+}
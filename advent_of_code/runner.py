@@ -0,0 +1,280 @@
+"""Running puzzle solutions, one at a time or in batches."""
+
+import ast
+import importlib
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .answers import AnswerCache
+from .registry import PUZZLES
+from .util import get_data, text_digest
+
+_package_path = Path(__file__).parent
+
+
+def import_solution(year: int, day: int):
+    """Import puzzle class by year and day.
+
+    The class is looked up from the registry, or found by scanning the
+    module source, if the registry is not up to date. Only the module of
+    the puzzle is imported.
+
+    Raises:
+        ModuleNotFoundError: Module for day and year is not found.
+        UserWarning: Class that inherits Puzzle is not found in module.
+    """
+    module_name = f"advent_of_code.y{year - 2000}.day{day:02}"
+    if (year, day) in PUZZLES:
+        module_name, class_name = PUZZLES[(year, day)]
+    else:
+        module_path = _package_path / f"y{year - 2000}" / f"day{day:02}.py"
+        if not module_path.exists():
+            raise ModuleNotFoundError(f"No module named '{module_name}'")
+        class_name = find_puzzle_class(module_path)
+        if class_name is None:
+            raise UserWarning(f"No puzzle found in {module_name}")
+
+    day_module = importlib.import_module(module_name)
+    return getattr(day_module, class_name)
+
+
+def puzzle_module_name(year: int, day: int) -> str:
+    """Name of the solution module, without importing it."""
+    if (year, day) in PUZZLES:
+        return PUZZLES[(year, day)][0]
+    return f"advent_of_code.y{year - 2000}.day{day:02}"
+
+
+def find_puzzle_class(module_path: Path) -> str | None:
+    """Find name of the first class that derives from Puzzle, without import."""
+    tree = ast.parse(module_path.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            name = getattr(base, "attr", getattr(base, "id", None))
+            if name == "Puzzle":
+                return node.name
+    return None
+
+
+def scan_puzzles() -> dict[tuple[int, int], tuple[str, str]]:
+    """Find all implemented puzzles from the package source.
+
+    Returns:
+        Module and class names by (year, day).
+    """
+    puzzles = {}
+    for child in sorted(_package_path.glob("y??/day??.py")):
+        class_name = find_puzzle_class(child)
+        if class_name is None:
+            continue
+        year = 2000 + int(child.parent.name[1:])
+        day = int(child.stem[3:])
+        module_name = f"advent_of_code.{child.parent.name}.{child.stem}"
+        puzzles[(year, day)] = (module_name, class_name)
+    return puzzles
+
+
+def registry_source(puzzles: dict[tuple[int, int], tuple[str, str]]) -> str:
+    """Python source of the registry module."""
+    lines = [
+        '"""Index of implemented puzzles.',
+        "",
+        "Generated by `python -m advent_of_code index`, do not edit by hand.",
+        '"""',
+        "",
+        "PUZZLES = {",
+    ]
+    for (year, day), (module_name, class_name) in sorted(puzzles.items()):
+        lines.append(f'    ({year}, {day}): ("{module_name}", "{class_name}"),')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def write_registry() -> Path:
+    """Regenerate the registry module from the package source."""
+    path = _package_path / "registry.py"
+    path.write_text(registry_source(scan_puzzles()), encoding="utf-8")
+    return path
+
+
+def discover_puzzles() -> list[tuple[int, int]]:
+    """All registered puzzles as (year, day) tuples, in order."""
+    return sorted(PUZZLES)
+
+
+@dataclass
+class RunOptions:
+
+    """Caching options for solving puzzles.
+
+    Attrs:
+        cache_parsed: Store parsed inputs on disk, see `Puzzle.cache_parsed`.
+        cache_answers: Return answers memoized for unchanged solution source
+          and input, store new answers.
+        verify: Recompute answers and compare them to memoized ones.
+        stream: Read input lazily line by line, if the solution supports it,
+          see `Puzzle.streaming`.
+    """
+
+    cache_parsed: bool = False
+    cache_answers: bool = False
+    verify: bool = False
+    stream: bool = False
+
+
+def solve(year: int, day: int, part: int, options: RunOptions | None = None):
+    """Solve one part of a puzzle.
+
+    Returns:
+        Tuple (answer, whether answer was memoized, input digest).
+
+    Raises:
+        AnswerMismatch: Verified answer differs from the memoized one.
+    """
+    options = options or RunOptions()
+    puzzle_cls = import_solution(year, day) if options.stream else None
+    if puzzle_cls is not None and puzzle_cls.streaming:
+        data = get_data(year=year, day=day, mode="lines")
+        input_hash = data.digest()
+    else:
+        data = get_data(year=year, day=day)
+        input_hash = text_digest(data)
+
+    cache = None
+    if options.cache_answers or options.verify:
+        cache = AnswerCache(
+            year, day, puzzle_module_name(year, day), input_hash=input_hash
+        )
+        if not options.verify and (answer := cache.get(part)) is not None:
+            return answer, True, input_hash
+
+    puzzle_cls = puzzle_cls or import_solution(year, day)
+    if isinstance(data, str):
+        puzzle = puzzle_cls(data)
+    else:
+        puzzle = puzzle_cls.from_lines(data)
+    if options.cache_parsed:
+        puzzle.cache_parsed = True
+    answer = puzzle.part1() if part == 1 else puzzle.part2()
+
+    if cache is not None:
+        cache.verify(part, answer)
+        cache.put(part, answer)
+    return answer, False, input_hash
+
+
+@dataclass
+class PartResult:
+
+    """Outcome of solving one part of a puzzle.
+
+    Attrs:
+        seconds: Wall time of parsing input and solving the part.
+        error: Error description, if solving failed.
+        skipped: Part is not implemented.
+        input_hash: Digest of the puzzle input.
+        cached: Answer was memoized, not computed.
+    """
+
+    year: int
+    day: int
+    part: int
+    answer: str | int | None = None
+    seconds: float | None = None
+    error: str | None = None
+    skipped: bool = False
+    input_hash: str | None = None
+    cached: bool = False
+
+    @property
+    def key(self) -> str:
+        """Identifier of the puzzle part, 'year/day/part'."""
+        return f"{self.year}/{self.day}/{self.part}"
+
+    @property
+    def status(self) -> str:
+        """Short description of the outcome."""
+        if self.skipped:
+            return "skipped"
+        if self.cached:
+            return "cached"
+        return "ok" if self.error is None else "FAIL"
+
+
+def solve_part(
+    year: int, day: int, part: int, options: RunOptions | None = None
+) -> PartResult:
+    """Solve one part of a puzzle, timing it and catching any errors."""
+    result = PartResult(year, day, part)
+    start = time.perf_counter()
+    try:
+        result.answer, result.cached, result.input_hash = solve(
+            year, day, part, options
+        )
+    except NotImplementedError:
+        result.skipped = True
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        result.error = f"{type(err).__name__}: {err}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_all(
+    puzzles: Iterable[tuple[int, int]],
+    workers: int | None = None,
+    durations: dict[str, float] | None = None,
+    options: RunOptions | None = None,
+) -> Iterator[PartResult]:
+    """Solve both parts of all given puzzles in a process pool.
+
+    Args:
+        puzzles: (year, day) tuples.
+        workers: Number of worker processes. Default: number of CPUs.
+        durations: Previously recorded wall times by 'year/day/part'. The
+          longest tasks are submitted first, and tasks without a record
+          before anything else.
+        options: Caching options.
+
+    Yields:
+        Results in the order of completion.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    durations = durations or {}
+    tasks = sorted(
+        ((year, day, part) for year, day in puzzles for part in (1, 2)),
+        key=lambda t: -durations.get("/".join(map(str, t)), float("inf")),
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(solve_part, *task, options): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                yield PartResult(*futures[future], error=f"{type(err).__name__}: {err}")
+
+
+def format_table(results: Iterable[PartResult]) -> str:
+    """Format results as a text table, ordered by year, day and part."""
+    rows = [("year", "day", "part", "answer", "time (s)", "status")]
+    for res in sorted(results, key=lambda r: (r.year, r.day, r.part)):
+        rows.append(
+            (
+                str(res.year),
+                str(res.day),
+                str(res.part),
+                "" if res.answer is None else str(res.answer),
+                f"{res.seconds:.3f}" if res.seconds is not None else "",
+                res.status if res.error is None else f"{res.status} {res.error}",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    return "\n".join(
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths)) + "  " + row[-1]
+        for row in rows
+    )
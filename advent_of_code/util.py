@@ -1,40 +1,262 @@
 """Utilities relating to Advent of Code integration."""
 
 
+import hashlib
+import io
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
-import requests
 
-
-def get_data(year: int, day: int) -> str:
+def get_data(year: int, day: int, mode="text") -> "str | bytes | LineReader":
     """Get input data, either cached or downloaded.
 
     First try to get cached data. If that does not exist, try to
     download the input file from Advent of Code. Downloading requires
     session ID cookie information.
 
+    Cached data may also be stored compressed, as `input.zst` or
+    `input.gz`, in place of `input`. Reading zstd files requires the
+    `zstandard` package.
+
+    Args:
+        mode: 'text' to return a string, 'bytes' to return raw bytes,
+          'mmap' to return a read-only memory map of the cache file, or
+          'lines' to return a `LineReader` that reads the cache file lazily.
+          As compressed files cannot be mapped, they are returned as bytes.
+
     Raises:
-        UserWarning if trying to download and session ID is not found.
+        UserWarning if trying to download and session ID is not found, or
+        if the download fails.
+    """
+    if mode not in ("text", "bytes", "mmap", "lines"):
+        raise ValueError(f"Unknown mode {mode!r}")
+
+    cache_dir = _get_cache_dir(day=day, year=year)
+    cache_file = cache_dir / "input"
+    if cache_file.exists():
+        if mode == "text":
+            return cache_file.read_text(encoding="utf-8")
+        if mode == "bytes":
+            return cache_file.read_bytes()
+        if mode == "lines":
+            return LineReader(cache_file)
+        return _map_file(cache_file)
+
+    for suffix, open_ in _decompressing_openers.items():
+        compressed = cache_dir / f"input{suffix}"
+        if compressed.exists():
+            if mode == "lines":
+                return LineReader(compressed)
+            with open_(compressed) as file_:
+                data = file_.read()
+            return data.decode("utf-8") if mode == "text" else data
+
+    text = _get_data_online(year=year, day=day)
+    _write_atomic(cache_file, text)
+    return text if mode == "text" else get_data(year, day, mode)
+
+
+def _map_file(path: Path):
+    """Map file read-only to memory. Empty files are returned as bytes."""
+    import mmap  # pylint: disable=import-outside-toplevel
+
+    with path.open("rb") as file_:
+        if os.fstat(file_.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class LineReader:
+
+    """Lines of a cached input file, read lazily in chunks.
+
+    Every iteration reads the file again from the start, so the reader can
+    be shared by both puzzle parts while memory use stays constant. Line
+    endings are stripped.
     """
-    cache_file = _get_cache_dir(day=day, year=year) / "input"
-    if not cache_file.exists():
-        text = _get_data_online(year=year, day=day)
-        cache_file.write_text(text, encoding="utf-8")
-        return text
 
-    return cache_file.read_text(encoding="utf-8")
+    def __init__(self, path: Path, chunk_size=1 << 20) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def _open_binary(self):
+        if self.path.suffix in _decompressing_openers:
+            raw = _decompressing_openers[self.path.suffix](self.path)
+            return io.BufferedReader(raw, self.chunk_size)
+        return self.path.open("rb", buffering=self.chunk_size)
+
+    def __iter__(self) -> Iterator[str]:
+        with io.TextIOWrapper(self._open_binary(), "utf-8") as file_:
+            for line in file_:
+                yield line.rstrip("\n")
+
+    def digest(self) -> str:
+        """Digest of the (decompressed) file, equal to `text_digest` of it."""
+        hash_ = hashlib.sha256()
+        with self._open_binary() as file_:
+            while chunk := file_.read(self.chunk_size):
+                hash_.update(chunk)
+        return hash_.hexdigest()
+
+
+def _open_zstd(path: Path):
+    # pylint: disable=import-outside-toplevel
+    try:
+        import zstandard
+    except ImportError as err:
+        raise UserWarning(
+            f"Reading {path} requires zstandard, install with `pip install zstandard`"
+        ) from err
+
+    return zstandard.ZstdDecompressor().stream_reader(path.open("rb"))
+
+
+def _open_gzip(path: Path):
+    import gzip  # pylint: disable=import-outside-toplevel
+
+    return gzip.open(path, "rb")
+
+
+_decompressing_openers = {".zst": _open_zstd, ".gz": _open_gzip}
+
 
+def text_digest(text: str | bytes) -> str:
+    """SHA-256 hex digest of text, e.g. for identifying puzzle inputs."""
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    return hashlib.sha256(text).hexdigest()
 
-def _get_data_online(year: int, day: int) -> str:
-    """Download input file from Advent of Code."""
-    session_id = _get_session_id()
-    uri = f"http://adventofcode.com/{year}/day/{day}/input"
-    response = requests.get(uri, cookies={"session": session_id}, timeout=5)
+
+def fetch_inputs(
+    year: int, days: Iterable[int], workers=4, interval=1.0, force=False
+) -> dict[int, str]:
+    """Download input files of several days to the cache.
+
+    Downloads share one connection-pooled session, run concurrently in a
+    bounded thread pool, and are started at most once per `interval`
+    seconds. Failed requests are retried with exponential backoff.
+
+    Args:
+        days: Days to be downloaded.
+        workers: Maximum number of concurrent downloads.
+        interval: Minimum time between starting requests, in seconds.
+        force: Download also days that are already cached.
+
+    Returns:
+        Outcome by day: 'cached', 'downloaded' or error description.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ThreadPoolExecutor
+
+    session = _make_session(_get_session_id(), pool_size=workers)
+    limiter = RateLimiter(interval)
+
+    def fetch(day: int) -> str:
+        cache_file = _get_cache_dir(year=year, day=day) / "input"
+        if cache_file.exists() and not force:
+            return "cached"
+        try:
+            text = _get_data_online(year, day, session=session, limiter=limiter)
+        except UserWarning as err:
+            return str(err)
+        _write_atomic(cache_file, text)
+        return "downloaded"
+
+    days = list(days)
+    with session, ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(days, executor.map(fetch, days)))
+
+
+class RateLimiter:
+
+    """Space out events by a minimum interval, across threads."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next event is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        time.sleep(start - now)
+
+
+def _make_session(session_id: str, pool_size=4, retries=3, backoff=0.5):
+    """Create requests session with connection pool and retries."""
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set("session", session_id)
+    session.headers["User-Agent"] = "github.com/mkouhia/advent-of-code"
+    return session
+
+
+def _get_data_online(year: int, day: int, session=None, limiter=None) -> str:
+    """Download input file from Advent of Code.
+
+    The site address can be overridden with environment variable
+    AOC_BASE_URL.
+
+    Raises:
+        UserWarning if the request fails or the response status is not 200.
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    if session is None:
+        session = _make_session(_get_session_id(), pool_size=1)
+    if limiter is not None:
+        limiter.wait()
+
+    base_url = os.environ.get("AOC_BASE_URL", "https://adventofcode.com")
+    uri = f"{base_url}/{year}/day/{day}/input"
+    try:
+        response = session.get(uri, timeout=10)
+    except requests.RequestException as err:
+        raise UserWarning(f"Download of {uri} failed: {err}") from err
+    if response.status_code != 200:
+        raise UserWarning(f"Download of {uri} failed: HTTP {response.status_code}")
     return response.text
 
 
-def _get_cache_dir(year: int, day: int, cache_root="~/.cache/advent_of_code") -> Path:
-    loc = Path(cache_root).expanduser() / str(year) / str(day)
+def _write_atomic(path: Path, text: str):
+    """Write text file so that readers never see a partial file."""
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    tmp_file.write_text(text, encoding="utf-8")
+    os.replace(tmp_file, path)
+
+
+def _get_cache_root() -> Path:
+    """Root directory of the local cache.
+
+    Defaults to ~/.cache/advent_of_code, can be overridden with the
+    environment variable AOC_CACHE_DIR.
+    """
+    return Path(os.environ.get("AOC_CACHE_DIR", "~/.cache/advent_of_code")).expanduser()
+
+
+def _get_cache_dir(year: int, day: int, cache_root: str | None = None) -> Path:
+    root = Path(cache_root).expanduser() if cache_root else _get_cache_root()
+    loc = root / str(year) / str(day)
 
     if not loc.exists():
         loc.mkdir(parents=True)
@@ -7,6 +7,8 @@ class Trebuchet(Puzzle):
 
     """Elf trebuchet calibration."""
 
+    streaming = True
+
     _spelled_digits = {
         "one": "1",
         "two": "2",
@@ -55,13 +57,11 @@ class Trebuchet(Puzzle):
     def part1(self) -> int:
         """Return sum of calibration values for each row."""
         return sum(
-            self.calibration_value(i, use_spelled_digits=False)
-            for i in self.input_text.splitlines()
+            self.calibration_value(i, use_spelled_digits=False) for i in self.lines()
         )
 
     def part2(self) -> int:
         """Return sum of calibration values for each row."""
         return sum(
-            self.calibration_value(i, use_spelled_digits=True)
-            for i in self.input_text.splitlines()
+            self.calibration_value(i, use_spelled_digits=True) for i in self.lines()
         )
@@ -1,6 +1,7 @@
 """https://adventofcode.com/2023/day/2"""
 
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 from ..base import Puzzle
@@ -10,19 +11,21 @@ class CubeConundrum(Puzzle):
 
     """Analyze game statistics, return possible games."""
 
-    def __init__(self, input_text: str) -> None:
-        super().__init__(input_text)
-        self.games = [Game.from_record(row) for row in input_text.splitlines()]
+    streaming = True
+
+    def games(self) -> Iterator["Game"]:
+        """Iterate over game records of the input."""
+        return (Game.from_record(row) for row in self.lines() if row)
 
     def part1(self) -> str:
         """Returns the sum of IDs for games that were possible."""
         return sum(
-            g.id_ for g in self.games if g.is_possible(red=12, green=13, blue=14)
+            g.id_ for g in self.games() if g.is_possible(red=12, green=13, blue=14)
         )
 
     def part2(self) -> str:
         """Returns the sum of power of cube sets."""
-        return sum(g.minimum_cubes().power() for g in self.games)
+        return sum(g.minimum_cubes().power() for g in self.games())
 
 
 @dataclass
@@ -1,8 +1,7 @@
 """https://adventofcode.com/2023/day/4"""
 
 import re
-
-import numpy as np
+from collections import deque
 
 from ..base import Puzzle
 
@@ -11,6 +10,8 @@ class ScratchCards(Puzzle):
 
     """Elf scratch card score counting."""
 
+    streaming = True
+
     @staticmethod
     def card_matches(row: str) -> int:
         """Calculate amount of matching numbers on each row"""
@@ -29,14 +30,20 @@ class ScratchCards(Puzzle):
 
     def part1(self) -> str | int:
         """Calculate total sum of card points in the pile."""
-        return sum(self.card_points(row) for row in self.input_text.split("\n") if row)
+        return sum(self.card_points(row) for row in self.lines() if row)
 
     def part2(self) -> str | int:
         """Calculate total amount of scratchcards in the end."""
-        card_matches = [
-            self.card_matches(row) for row in self.input_text.split("\n") if row
-        ]
-        card_amounts = np.ones_like(card_matches, dtype=int)
-        for i, num in enumerate(card_matches):
-            card_amounts[i + 1 : i + 1 + num] += card_amounts[i]
-        return np.sum(card_amounts)
+        # Copies won for the following cards, only as far as matches reach
+        pending = deque()
+        total = 0
+        for row in self.lines():
+            if not row:
+                continue
+            amount = 1 + (pending.popleft() if pending else 0)
+            total += amount
+            num = self.card_matches(row)
+            pending.extend([0] * (num - len(pending)))
+            for i in range(num):
+                pending[i] += amount
+        return total
@@ -15,22 +15,20 @@ class WaitForIt(Puzzle):
         super().__init__(input_text)
         self.races = None
 
+    def parse(self) -> list[list[str]]:
+        """Digit groups on time and distance rows."""
+        return [re.findall(r"\d+", row) for row in self.input_text.strip().split("\n")]
+
     def part1(self) -> str | int:
         """Find out, how many winning combinations there are."""
-        times, distances = [
-            [int(i) for i in re.findall(r"\d+", row)]
-            for row in self.input_text.strip().split("\n")
-        ]
+        times, distances = [[int(i) for i in row] for row in self.parsed]
         self.races = [Race(*i) for i in list(zip(times, distances))]
 
         return self.ways_to_beat()
 
     def part2(self) -> str | int:
         """Same as part1, but all numbers map to one game."""
-        time, distance = [
-            int("".join(re.findall(r"\d+", row)))
-            for row in self.input_text.strip().split("\n")
-        ]
+        time, distance = [int("".join(row)) for row in self.parsed]
         self.races = [Race(time, distance)]
 
         return self.ways_to_beat()
@@ -1,5 +1,7 @@
 """https://adventofcode.com/2023/day/9"""
 
+from collections.abc import Iterator
+
 import numpy as np
 from ..base import Puzzle
 
@@ -8,12 +10,18 @@ class MirageMaintenance(Puzzle):
 
     """Predict OASIS sensor values."""
 
-    def __init__(self, input_text: str) -> None:
-        super().__init__(input_text)
-        self.histories = [
-            np.array([int(i) for i in row.split(" ")])
-            for row in input_text.strip().splitlines()
-        ]
+    streaming = True
+
+    def iter_histories(self) -> Iterator[np.ndarray]:
+        """Iterate over value histories of the input."""
+        for row in self.lines():
+            if row.strip():
+                yield np.array([int(i) for i in row.split()])
+
+    @property
+    def histories(self) -> list[np.ndarray]:
+        """All value histories of the input."""
+        return list(self.iter_histories())
 
     @staticmethod
     def row_history(row: np.ndarray, record_idx=-1) -> list[int]:
@@ -41,8 +49,8 @@ class MirageMaintenance(Puzzle):
 
     def part1(self) -> str | int:
         """Sum of extrapolated last values."""
-        return sum(self.predict_last(row) for row in self.histories)
+        return sum(self.predict_last(row) for row in self.iter_histories())
 
     def part2(self) -> str | int:
         """Sum of extrapolated first values."""
-        return sum(self.predict_first(row) for row in self.histories)
+        return sum(self.predict_first(row) for row in self.iter_histories())
@@ -11,21 +11,20 @@ class HotSprings(Puzzle):
 
     """Packing of strings in records."""
 
-    def part1(self) -> str | int:
-        """Number of possible packing options."""
-        records = [
+    def parse(self) -> list["ConditionRecord"]:
+        """Condition records, one per input row."""
+        return [
             ConditionRecord.from_string(row)
             for row in self.input_text.strip().splitlines()
         ]
-        return sum(record.n_replacements() for record in records)
+
+    def part1(self) -> str | int:
+        """Number of possible packing options."""
+        return sum(record.n_replacements() for record in self.parsed)
 
     def part2(self) -> str | int:
         """Number of possible options, first expanding the pattern."""
-        records = [
-            ConditionRecord.from_string_part2(row)
-            for row in self.input_text.strip().splitlines()
-        ]
-        return sum(record.n_replacements() for record in records)
+        return sum(record.expanded().n_replacements() for record in self.parsed)
 
 
 @dataclass
@@ -57,6 +56,10 @@ class ConditionRecord:
         spec2 = cls.expand_spec(spec)
         return cls.from_string(spec2)
 
+    def expanded(self) -> "ConditionRecord":
+        """Expanded record for part 2."""
+        return ConditionRecord(self.expand_spec(self.spec), self.groups * 5)
+
     @staticmethod
     def group_lengths(cond_spec: str):
         """Calculate lengths of repeating # characters in a string."""
@@ -1,59 +1,345 @@
 """https://adventofcode.com/2023/day/14"""
 
-from collections.abc import Iterable
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+import functools
 import itertools
 
 from ..base import Puzzle
-from ..helpers import ResultCycler
+from ..helpers import ResultCycler, state_digest, to_numpy_array
+
+
+def pack_string(original: Iterable[str], reverse=False) -> str:
+    """Take original string, pack O characters to beginnings.
+
+    Characters # act as blockers.
+    """
+
+    def safe_pack(part: str, reverse: bool) -> str:
+        if reverse:
+            return "." * part.count(".") + "O" * part.count("O")
+        return "O" * part.count("O") + "." * part.count(".")
+
+    start_ = sum(1 for _ in itertools.takewhile(lambda c: c == "#", original))
+    ret = start_ * "#"
+
+    while "#" in original[start_:]:
+        end2 = original.index("#", start_)
+        part = original[start_:end2]
+        ret += safe_pack(part, reverse) + "#"
+        start_ = end2 + 1
+
+    return ret + safe_pack(original[start_:], reverse)
+
+
+class TiltEngine(ABC):
+
+    """Stones of a dish, tilted in place towards N, W, S or E."""
+
+    @abstractmethod
+    def __init__(self, rows: list[str]) -> None:
+        ...
+
+    @abstractmethod
+    def tilt(self, direction: str):
+        """Roll rounded stones O towards direction, until blocked."""
+
+    @abstractmethod
+    def rows(self) -> list[str]:
+        """Current pattern, row by row."""
+
+    @abstractmethod
+    def total_load(self) -> int:
+        """Sum of distances of rounded stones from the south edge."""
+
+    @abstractmethod
+    def state(self) -> bytes:
+        """Compact representation of the stones, which identifies the pattern."""
+
+    def fingerprint(self):
+        """Hashable identifier of the pattern for cycle detection."""
+        return state_digest(self.state())
+
+
+class StringTilt(TiltEngine):
+
+    """Rows of text, packed one row or column at a time."""
+
+    def __init__(self, rows: list[str]) -> None:
+        self._rows = rows
+
+    def tilt(self, direction: str):
+        reverse = direction in "SE"
+        if direction in "WE":
+            self._rows = [pack_string(r, reverse=reverse) for r in self._rows]
+        else:
+            cols_packed = (pack_string(c, reverse=reverse) for c in zip(*self._rows))
+            self._rows = list(zip(*cols_packed))
+
+    def rows(self) -> list[str]:
+        return ["".join(r) for r in self._rows]
+
+    def total_load(self) -> int:
+        rows = list(self._rows)
+        return sum(
+            row_no * row.count("O")
+            for row, row_no in zip(rows, range(len(rows), 0, -1))
+        )
+
+    def state(self) -> bytes:
+        return "\n".join(self.rows()).encode()
+
+
+class ArrayTilt(TiltEngine):
+
+    """Flat boolean array of rounded stones, tilted without transposing.
+
+    Free cells are split into segments between blockers along each tilt
+    direction, and each cell has a rank, its distance from the start of
+    its segment. A tilt counts the stones per segment, and puts them on
+    the cells of lowest rank.
+    """
+
+    def __init__(self, rows: list[str]) -> None:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        grid = to_numpy_array("\n".join(rows).encode(), "S")
+        self.shape = grid.shape
+        self.free = (grid != b"#").ravel()
+        self.rocks = (grid == b"O").ravel()
+        self._weights = np.repeat(np.arange(self.shape[0], 0, -1), self.shape[1])
+
+        free = self.free.reshape(self.shape)
+        views = {
+            "N": (lambda a: a.T, lambda a: a.T),
+            "W": (lambda a: a, lambda a: a),
+            "S": (lambda a: a[::-1].T, lambda a: a.T[::-1]),
+            "E": (lambda a: a[:, ::-1], lambda a: a[:, ::-1]),
+        }
+        self._layout = {}
+        for direction, (to_view, from_view) in views.items():
+            seg, rank, n_seg = self._segments(np.ascontiguousarray(to_view(free)))
+            self._layout[direction] = (
+                from_view(seg).ravel().astype(np.int32),
+                from_view(rank).ravel().astype(np.int32),
+                n_seg,
+            )
+
+    @staticmethod
+    def _segments(free):
+        """Segment ids and ranks of free cells, tilting along rows to the left.
+
+        Blocked cells belong to an extra segment, which never has stones.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        prev_blocked = np.ones_like(free)
+        prev_blocked[:, 1:] = ~free[:, :-1]
+        starts = (free & prev_blocked).ravel()
+        start_pos = np.flatnonzero(starts)
+        if not start_pos.size:
+            zeros = np.zeros(free.shape, dtype=np.intp)
+            return zeros, zeros, 0
+        seg = np.cumsum(starts) - 1
+        rank = np.arange(free.size) - start_pos[seg]
+        flat_free = free.ravel()
+        seg = np.where(flat_free, seg, len(start_pos))
+        rank = np.where(flat_free, rank, 0)
+        return seg.reshape(free.shape), rank.reshape(free.shape), len(start_pos)
+
+    def tilt(self, direction: str):
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        seg, rank, n_seg = self._layout[direction]
+        counts = np.bincount(seg[self.rocks], minlength=n_seg + 1)
+        self.rocks = rank < counts[seg]
+
+    def rows(self) -> list[str]:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        chars = np.where(self.free, ".", "#")
+        chars[self.rocks] = "O"
+        return ["".join(row) for row in chars.reshape(self.shape)]
+
+    def total_load(self) -> int:
+        return int(self._weights[self.rocks].sum())
+
+    def state(self) -> bytes:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        return np.packbits(self.rocks).tobytes()
+
+
+@functools.cache
+def _compiled_tilt():
+    """Tilt kernel for `NumbaTilt`, compiled on first use."""
+    import numba  # pylint: disable=import-outside-toplevel
+
+    @numba.njit(nogil=True)
+    def tilt(rocks, seg, rank, counts):
+        counts[:] = 0
+        for i in range(rocks.size):
+            if rocks[i]:
+                counts[seg[i]] += 1
+        for i in range(rocks.size):
+            rocks[i] = rank[i] < counts[seg[i]]
+
+    return tilt
+
+
+class NumbaTilt(ArrayTilt):
+
+    """Segments and ranks as in `ArrayTilt`, tilted in place by a jitted loop."""
+
+    def __init__(self, rows: list[str]) -> None:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        super().__init__(rows)
+        self._kernel = _compiled_tilt()
+        n_counts = max(n_seg for _, _, n_seg in self._layout.values()) + 1
+        self._counts = np.zeros(n_counts, dtype=np.int32)
+
+    def tilt(self, direction: str):
+        seg, rank, _ = self._layout[direction]
+        self._kernel(self.rocks, seg, rank, self._counts)
+
+
+class BitsetTilt(TiltEngine):
+
+    """Stones and free cells as bits of two Python integers.
+
+    Cell (x, y) is bit y * (width + 1) + x. The extra column is never free,
+    and keeps stones from rolling over row ends. A tilt shifts the stones,
+    which have a free neighbour towards the direction, by one cell, until
+    none can move. The stones integer is exact, so it is the fingerprint.
+    """
+
+    def __init__(self, rows: list[str]) -> None:
+        self.shape = (len(rows), len(rows[0]))
+        self.stride = self.shape[1] + 1
+        self.free = 0
+        self.rocks = 0
+        for y, row in enumerate(rows):
+            offset = y * self.stride
+            for x, char in enumerate(row):
+                if char != "#":
+                    self.free |= 1 << (offset + x)
+                if char == "O":
+                    self.rocks |= 1 << (offset + x)
+        self._shifts = {"N": self.stride, "W": 1, "S": -self.stride, "E": -1}
+
+    def tilt(self, direction: str):
+        shift = self._shifts[direction]
+        rocks = self.rocks
+        while True:
+            empty = self.free & ~rocks
+            if shift > 0:
+                moving = rocks & (empty << shift)
+                rocks ^= moving | (moving >> shift)
+            else:
+                moving = rocks & (empty >> -shift)
+                rocks ^= moving | (moving << -shift)
+            if not moving:
+                break
+        self.rocks = rocks
+
+    def _row_bits(self, bits: int) -> Iterator[int]:
+        mask = (1 << self.shape[1]) - 1
+        for y in range(self.shape[0]):
+            yield (bits >> (y * self.stride)) & mask
+
+    def rows(self) -> list[str]:
+        return [
+            "".join(
+                "O" if rocks >> x & 1 else "." if free >> x & 1 else "#"
+                for x in range(self.shape[1])
+            )
+            for rocks, free in zip(
+                self._row_bits(self.rocks), self._row_bits(self.free)
+            )
+        ]
+
+    def total_load(self) -> int:
+        return sum(
+            (self.shape[0] - y) * row.bit_count()
+            for y, row in enumerate(self._row_bits(self.rocks))
+        )
+
+    def state(self) -> bytes:
+        return self.rocks.to_bytes((self.shape[0] * self.stride + 7) // 8, "little")
+
+    def fingerprint(self) -> int:
+        return self.rocks
 
 
 class ParabolicReflectorDish(Puzzle, ResultCycler):
 
-    """A rotating platform containing movable or immovable stones."""
+    """A rotating platform containing movable or immovable stones.
+
+    Attrs:
+        engines: Available tilt engines by name.
+    """
+
+    engines: dict[str, type[TiltEngine]] = {
+        "string": StringTilt,
+        "numpy": ArrayTilt,
+        "numba": NumbaTilt,
+        "bitset": BitsetTilt,
+    }
 
-    def __init__(self, input_text: str) -> None:
+    def __init__(self, input_text: str, engine="numpy") -> None:
         super().__init__(input_text)
-        self.rows = self.input_text.strip().splitlines()
+        if engine not in self.engines:
+            raise ValueError(
+                f"Unknown engine {engine!r}, use one of {sorted(self.engines)}"
+            )
+        self.engine = self.engines[engine](self.input_text.strip().splitlines())
 
     def __hash__(self) -> int:
         """Returns hash corresponding to the pattern."""
-        return hash(self.pattern)
+        return hash(self.engine.state())
+
+    def cycle_state(self) -> bytes:
+        return self.engine.state()
+
+    def fingerprint(self):
+        """Identifier of the stone positions, safe against collisions."""
+        return self.engine.fingerprint()
+
+    @property
+    def rows(self) -> list[str]:
+        """Rows of the current pattern."""
+        return self.engine.rows()
 
     @property
     def pattern(self) -> str:
         """Get string pattern of the stones."""
-        return "\n".join("".join(r) for r in self.rows)
+        return "\n".join(self.engine.rows())
 
     def pack_north(self) -> "ParabolicReflectorDish":
         """Tilt the dish towards north, pack stones to the top of board."""
-        col_iterables = zip(*self.rows)
-        cols_packed = map(self.pack_string, col_iterables)
-        self.rows = list(zip(*cols_packed))
+        self.engine.tilt("N")
         return self
 
     def pack_east(self) -> "ParabolicReflectorDish":
         """Tilt the dish towards east, pack stones to the right of board."""
-        self.rows = [self.pack_string(r, reverse=True) for r in self.rows]
+        self.engine.tilt("E")
         return self
 
     def pack_south(self) -> "ParabolicReflectorDish":
         """Tilt the dish towards south, pack stones to the bottom of board."""
-        col_iterables = zip(*self.rows)
-        cols_packed = (self.pack_string(c, reverse=True) for c in col_iterables)
-        self.rows = list(zip(*cols_packed))
+        self.engine.tilt("S")
         return self
 
     def pack_west(self) -> "ParabolicReflectorDish":
         """Tilt the dish towards west, pack stones to the left of board."""
-        self.rows = [self.pack_string(r) for r in self.rows]
+        self.engine.tilt("W")
         return self
 
     def pack_cycle(self):
         """Tilt the dish one cycle; pack north, west, south, east."""
-        self.pack_north()
-        self.pack_west()
-        self.pack_south()
-        self.pack_east()
+        for direction in "NWSE":
+            self.engine.tilt(direction)
         return self
 
     @classmethod
@@ -62,30 +348,11 @@ class ParabolicReflectorDish(Puzzle, ResultCycler):
 
         Characters # act as blockers.
         """
-
-        def safe_pack(part: str, reverse: bool) -> str:
-            if reverse:
-                return "." * part.count(".") + "O" * part.count("O")
-            return "O" * part.count("O") + "." * part.count(".")
-
-        start_ = sum(1 for _ in itertools.takewhile(lambda c: c == "#", original))
-        ret = start_ * "#"
-
-        while "#" in original[start_:]:
-            end2 = original.index("#", start_)
-            part = original[start_:end2]
-            ret += safe_pack(part, reverse) + "#"
-            start_ = end2 + 1
-
-        return ret + safe_pack(original[start_:], reverse)
+        return pack_string(original, reverse=reverse)
 
     def total_load(self) -> int:
         """Calculate total load of the reflector dish."""
-        rows = list(self.rows)
-        return sum(
-            row_no * row.count("O")
-            for row, row_no in zip(rows, range(len(rows), 0, -1))
-        )
+        return self.engine.total_load()
 
     def get_result(self):
         return self.total_load()
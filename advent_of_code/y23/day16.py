@@ -1,7 +1,32 @@
 """https://adventofcode.com/2023/day/16"""
 
+from __future__ import annotations
+
 import itertools
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 from ..base import Puzzle
+from ..helpers import strongly_connected_components
+
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+# Unit steps (dy, dx) by direction, as in `Beam`
+_DELTAS = ((0, 1), (-1, 0), (0, -1), (1, 0))
+
+# Outgoing directions by grid character and incoming direction
+_EXITS = {
+    ".": ((0,), (1,), (2,), (3,)),
+    "/": ((1,), (0,), (3,), (2,)),
+    "\\": ((3,), (2,), (1,), (0,)),
+    "|": ((1, 3), (1,), (1, 3), (3,)),
+    "-": ((0,), (0, 2), (2,), (0, 2)),
+}
 
 
 class Beam:
@@ -57,18 +82,341 @@ class Beam:
         return (self.x, self.y, self.dir)
 
 
+class _CellSet:
+
+    """Bitset of grid cells, with bits set lazily in batches."""
+
+    def __init__(self, words: np.ndarray) -> None:
+        self.words = words
+        self.pending: list[int] = []
+
+    def flush(self):
+        if self.pending:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+
+            cells = np.array(self.pending, dtype=np.uint64)
+            np.bitwise_or.at(
+                self.words,
+                cells >> np.uint64(6),
+                np.uint64(1) << (cells & np.uint64(63)),
+            )
+            self.pending.clear()
+
+    def copy(self) -> "_CellSet":
+        self.flush()
+        return _CellSet(self.words.copy())
+
+    def update(self, other: "_CellSet"):
+        other.flush()
+        self.words |= other.words
+
+    def count(self) -> int:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self.flush()
+        # np.bitwise_count needs NumPy 2; unpackbits works on 1.x as well.
+        return int(np.unpackbits(self.words.view(np.uint8)).sum())
+
+
+class BeamGraph:
+
+    """States of beam heads and their successors.
+
+    A state is a beam entering a cell in some direction, numbered
+    (y * width + x) * 4 + direction. Cycles of states are collapsed into
+    strongly connected components, which form a directed acyclic graph.
+
+    Attrs:
+        successors: States following each state, within the grid.
+    """
+
+    def __init__(self, rows: list[str]) -> None:
+        self.shape = (len(rows), len(rows[0]))
+        height, width = self.shape
+        self.successors: list[tuple[int, ...]] = []
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                for exits in _EXITS[char]:
+                    succ = []
+                    for dir_ in exits:
+                        y_next = y + _DELTAS[dir_][0]
+                        x_next = x + _DELTAS[dir_][1]
+                        if 0 <= y_next < height and 0 <= x_next < width:
+                            succ.append((y_next * width + x_next) * 4 + dir_)
+                    self.successors.append(tuple(succ))
+
+    def state(self, y: int, x: int, dir_: int) -> int:
+        """State number of a beam entering cell (y, x) in direction dir_."""
+        return (y * self.shape[1] + x) * 4 + dir_
+
+    def energized(self, entries: Iterable[int]) -> list[int]:
+        """Number of cells energized by a beam entering in each entry state.
+
+        Cells reachable from a component are the union of its own cells and
+        those of its successor components. Components are processed from
+        sinks up, and each cell set is kept only until all predecessors have
+        used it; the last one takes it over without copying.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        entries = list(entries)
+        component, n_components = strongly_connected_components(
+            self.successors, roots=entries
+        )
+        own_cells: list[list[int]] = [[] for _ in range(n_components)]
+        comp_succ: list[set[int]] = [set() for _ in range(n_components)]
+        for state, comp in enumerate(component):
+            if comp < 0:
+                continue
+            own_cells[comp].append(state >> 2)
+            for succ in self.successors[state]:
+                if component[succ] != comp:
+                    comp_succ[comp].add(component[succ])
+
+        n_preds = [0] * n_components
+        for succs in comp_succ:
+            for comp in succs:
+                n_preds[comp] += 1
+        counted = {component[state]: None for state in entries}
+
+        n_words = (self.shape[0] * self.shape[1] + 63) // 64
+        live: dict[int, _CellSet] = {}
+        for comp in range(n_components):
+            cells = None
+            for succ in comp_succ[comp]:
+                n_preds[succ] -= 1
+                if cells is None and n_preds[succ] == 0:
+                    cells = live.pop(succ)
+            for succ in comp_succ[comp]:
+                if succ not in live:
+                    continue
+                if cells is None:
+                    cells = live[succ].copy()
+                else:
+                    cells.update(live[succ])
+                if n_preds[succ] == 0:
+                    del live[succ]
+            if cells is None:
+                cells = _CellSet(np.zeros(n_words, dtype=np.uint64))
+            cells.pending.extend(own_cells[comp])
+
+            if comp in counted:
+                counted[comp] = cells.count()
+            if n_preds[comp] > 0:
+                live[comp] = cells
+        return [counted[component[state]] for state in entries]
+
+
+class BeamSimulator:
+
+    """Beams on a flat byte grid, without allocating objects per step.
+
+    The grid is surrounded by a border of zero bytes, and cells are indices
+    of the flat grid. A state cell * 4 + direction is a beam entering the
+    cell in that direction. A transition table gives the differences to the
+    next states by grid byte and direction, and visited directions are bits
+    of one byte per cell. Border cells are marked visited from the start,
+    so beams leaving the grid stop without bounds checks.
+
+    Attrs:
+        grid: Grid bytes with border, row by row.
+        width: Row length of grid, including border.
+    """
+
+    def __init__(self, rows: list[str]) -> None:
+        width = len(rows[0]) + 2
+        border = bytes(width)
+        inner = b"".join(b"\0" + row.encode("ascii") + b"\0" for row in rows)
+        self._setup(border + inner + border, width)
+
+    @classmethod
+    def from_buffer(cls, grid, width: int) -> "BeamSimulator":
+        """Simulator on bytes-like grid with border, such as shared memory."""
+        simulator = cls.__new__(cls)
+        simulator._setup(grid, width)
+        return simulator
+
+    def _setup(self, grid, width: int):
+        self.grid = grid
+        self.width = width
+        self.n_cells = (len(grid) // width - 2) * (width - 2)
+        self._unvisited = bytes(grid).translate(bytes([15]) + bytes(255))
+
+        steps = (1, -width, -1, width)
+        self._transitions: list[tuple[int, ...]] = [()] * (256 * 4)
+        for char, exits in _EXITS.items():
+            for dir_, out_dirs in enumerate(exits):
+                self._transitions[ord(char) * 4 + dir_] = tuple(
+                    steps[out] * 4 + out - dir_ for out in out_dirs
+                )
+
+    def energized(self, y: int, x: int, dir_: int) -> int:
+        """Number of cells energized by a beam entering cell (y, x)."""
+        grid = self.grid
+        transitions = self._transitions
+        visited = bytearray(self._unvisited)
+        stack = [((y + 1) * self.width + x + 1) * 4 + dir_]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            state = pop()
+            cell = state >> 2
+            bit = 1 << (state & 3)
+            if visited[cell] & bit:
+                continue
+            visited[cell] |= bit
+            for diff in transitions[(grid[cell] << 2) | (state & 3)]:
+                push(state + diff)
+        return self.n_cells - visited.count(0)
+
+    def trace(self, y: int, x: int, dir_: int) -> "BeamTrace":
+        """Simulate a beam entering cell (y, x) as `energized`, and record it.
+
+        The loop is a copy of the one in `energized`, with counters added,
+        so that simulating without a trace has no overhead.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        grid = self.grid
+        transitions = self._transitions
+        visited = bytearray(self._unvisited)
+        visits = array("q", bytes(8 * len(grid)))
+        splits = array("q", bytes(8 * len(grid)))
+        stack = [((y + 1) * self.width + x + 1) * 4 + dir_]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            state = pop()
+            cell = state >> 2
+            visits[cell] += 1
+            bit = 1 << (state & 3)
+            if visited[cell] & bit:
+                continue
+            visited[cell] |= bit
+            diffs = transitions[(grid[cell] << 2) | (state & 3)]
+            splits[cell] += len(diffs) - 1
+            for diff in diffs:
+                push(state + diff)
+
+        shape = (len(grid) // self.width, self.width)
+        directions = np.frombuffer(visited, dtype=np.uint8).reshape(shape)
+        data = np.stack(
+            [
+                np.frombuffer(visits, dtype=np.int64).reshape(shape),
+                np.frombuffer(splits, dtype=np.int64).reshape(shape),
+                *((directions >> dir_) & 1 for dir_ in range(4)),
+            ]
+        )
+        return BeamTrace(data[:, 1:-1, 1:-1].copy())
+
+
+class BeamTrace:
+
+    """Recorded beam simulation, as one array of shape (6, height, width).
+
+    Channels are the number of times a beam entered each cell, the number
+    of beam splits at each cell, and whether a beam passed each cell in
+    directions 0-3 (east, north, west, south), one channel per direction.
+    """
+
+    channels = ("visits", "splits", "east", "north", "west", "south")
+
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+
+    @property
+    def visits(self) -> np.ndarray:
+        """Number of beams entering each cell."""
+        return self.data[0]
+
+    @property
+    def splits(self) -> np.ndarray:
+        """Number of beam splits at each cell."""
+        return self.data[1]
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """Boolean array (4, height, width), cell passed in direction."""
+        return self.data[2:].astype(bool)
+
+    @property
+    def energized(self) -> np.ndarray:
+        """Boolean array of energized cells."""
+        return self.coverage.any(axis=0)
+
+    def save(self, path: Path | str):
+        """Save as NumPy array to a .npy file, or as images to a .png file."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        path = Path(path)
+        if path.suffix == ".npy":
+            np.save(path, self.data)
+        elif path.suffix == ".png":
+            self.figure().savefig(path)
+        else:
+            raise ValueError(f"Unsupported file type {path.suffix!r}, use .npy or .png")
+
+    def figure(self):
+        """Matplotlib figure of visits, splits and directions of beams."""
+        from matplotlib.figure import Figure  # pylint: disable=import-outside-toplevel
+
+        fig = Figure(figsize=(12, 8), layout="constrained")
+        for ax, name, image in zip(fig.subplots(2, 3).flat, self.channels, self.data):
+            ax.imshow(image, interpolation="nearest")
+            ax.set_title(name)
+            ax.set_axis_off()
+        return fig
+
+
+# Simulator of a pool worker process, on the shared grid
+_worker_simulator: BeamSimulator | None = None
+_worker_memory: shared_memory.SharedMemory | None = None
+
+
+def _attach_grid(name: str, size: int, width: int):
+    """Pool initializer, simulate beams on the grid in shared memory."""
+    global _worker_simulator, _worker_memory  # pylint: disable=global-statement
+    from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_simulator = BeamSimulator.from_buffer(_worker_memory.buf[:size], width)
+
+
+def _max_energized_chunk(entries: list[tuple[int, int, int]]) -> int:
+    """Maximum number of energized cells by entries (y, x, dir)."""
+    return max(_worker_simulator.energized(*entry) for entry in entries)
+
+
 class TheFloorWillBeLava(Puzzle):
 
-    """Beam reflection in a contraption."""
+    """Beam reflection in a contraption.
+
+    Attrs:
+        strategies: Ways to solve part 2. Strategy 'graph' finds energized
+          cells on the graph of beam states, see `BeamGraph`, and
+          'simulate' simulates each entry beam.
+        strategy: Strategy of part 2, one of `strategies`.
+        workers: Number of processes simulating entry beams, if the
+          strategy is 'simulate'.
+    """
+
+    strategies = ("graph", "simulate")
 
-    def __init__(self, input_text: str) -> None:
+    def __init__(self, input_text: str, strategy="graph", workers=1) -> None:
         super().__init__(input_text)
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown strategy {strategy!r}, use {self.strategies}")
+        self.strategy = strategy
+        self.workers = int(workers)
         self.rows = input_text.strip().splitlines()
         self.shape = (len(self.rows), len(self.rows[0]))
-        self.setup()
 
     def setup(self, beam=None):
-        """Reset with initial beam."""
+        """Reset step-wise simulation with initial beam, see `_max_energized`.
+
+        The grid of energized cells is only allocated here, as the solved
+        parts use `BeamSimulator` and `BeamGraph` instead.
+        """
         self.energized = [
             [False for _ in range(self.shape[1])] for _ in range(self.shape[0])
         ]
@@ -128,21 +476,70 @@ class TheFloorWillBeLava(Puzzle):
 
     def part1(self) -> str | int:
         """Returns total number of energized cells at the end."""
-        return self._max_energized()
+        return BeamSimulator(self.rows).energized(0, 0, 0)
 
-    def part2(self) -> str | int:
-        """Maximum energization value, beam from any direction."""
-        max_val = 0
+    def trace(self, entry=(0, 0, 0)) -> BeamTrace:
+        """Record visits, splits and directions of a beam entering at (y, x, dir)."""
+        return BeamSimulator(self.rows).trace(*entry)
+
+    def entries(self) -> list[tuple[int, int, int]]:
+        """First cells (y, x, dir) of beams entering from any edge."""
+        entries = []
         for dir_ in range(4):
             if dir_ in [0, 2]:
                 y = range(self.shape[0])
-                x = [-1] if dir_ == 0 else [self.shape[1]]
+                x = [0] if dir_ == 0 else [self.shape[1] - 1]
             else:
-                y = [-1] if dir_ == 3 else [self.shape[0]]
+                y = [0] if dir_ == 3 else [self.shape[0] - 1]
                 x = range(self.shape[1])
+            entries.extend((y_, x_, dir_) for y_, x_ in itertools.product(y, x))
+        return entries
+
+    def _simulate_parallel(self, entries: list[tuple[int, int, int]]) -> int:
+        """Maximum energization of entry beams, simulated in a process pool.
+
+        The grid is shared with the workers once, and only the maximum of
+        each chunk of beams is returned.
+        """
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from multiprocessing import shared_memory
+
+        from tqdm import tqdm
 
-            for y_, x_ in itertools.product(y, x):
-                beam = Beam(y_, x_, dir_)
-                if (value := self._max_energized(beam)) > max_val:
-                    max_val = value
+        grid = BeamSimulator(self.rows).grid
+        memory = shared_memory.SharedMemory(create=True, size=len(grid))
+        memory.buf[: len(grid)] = grid
+        n_chunks = 4 * self.workers
+        chunks = [entries[i::n_chunks] for i in range(n_chunks)]
+        max_val = 0
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_attach_grid,
+                initargs=(memory.name, len(grid), self.shape[1] + 2),
+            ) as executor, tqdm(total=len(entries), unit="beam", disable=None) as bar:
+                futures = {
+                    executor.submit(_max_energized_chunk, chunk): len(chunk)
+                    for chunk in chunks
+                    if chunk
+                }
+                for future in as_completed(futures):
+                    max_val = max(max_val, future.result())
+                    bar.update(futures[future])
+        finally:
+            memory.close()
+            memory.unlink()
         return max_val
+
+    def part2(self) -> str | int:
+        """Maximum energization value, beam from any direction."""
+        entries = self.entries()
+        if self.strategy == "simulate":
+            if self.workers > 1:
+                return self._simulate_parallel(entries)
+            simulator = BeamSimulator(self.rows)
+            return max(simulator.energized(*entry) for entry in entries)
+
+        graph = BeamGraph(self.rows)
+        return max(graph.energized(graph.state(*entry) for entry in entries))
@@ -1,9 +1,385 @@
 """https://adventofcode.com/2023/day/17"""
 
+from __future__ import annotations
+
 import heapq
+import importlib.util
+import itertools
+import warnings
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache, cached_property
+from typing import TYPE_CHECKING
 
 from ..base import Puzzle
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass
+class SearchResult:
+
+    """Least heat loss found by a search, and how many states it expanded."""
+
+    heat_loss: int
+    expanded: int
+
+
+# Heat loss of states not reached by `_compiled_search`, int32 maximum
+_UNREACHED = 2**31 - 1
+
+
+@cache
+def _compiled_search():
+    """Least heat loss search for `HeatLossGrid.search_numba`, compiled on first use."""
+    import numba  # pylint: disable=import-outside-toplevel
+
+    @numba.njit(nogil=True)
+    def relax(heap, dist, state, new_dist):
+        if new_dist < dist[state]:
+            dist[state] = new_dist
+            heapq.heappush(heap, (new_dist, state))
+
+    @numba.njit(nogil=True)
+    def search(costs, dist, start_y, start_x, end_y, end_x, min_leg, max_leg):
+        height, width = costs.shape
+        dist[:] = _UNREACHED
+        heap = [(0, 0)]
+        heap.pop()
+        for axis in range(2):
+            state = (start_y * width + start_x) * 2 + axis
+            dist[state] = 0
+            heapq.heappush(heap, (0, state))
+
+        expanded = 0
+        while heap:
+            state_dist, state = heapq.heappop(heap)
+            if state_dist != dist[state]:
+                continue
+            expanded += 1
+            y, x = divmod(state >> 1, width)
+            if y == end_y and x == end_x:
+                return state_dist, expanded
+
+            for sign in (1, -1):
+                loss = state_dist
+                for leg in range(1, max_leg + 1):
+                    if state & 1:
+                        x_new = x + sign * leg
+                        if not 0 <= x_new < width:
+                            break
+                        loss += costs[y, x_new]
+                        new_state = (y * width + x_new) * 2
+                    else:
+                        y_new = y + sign * leg
+                        if not 0 <= y_new < height:
+                            break
+                        loss += costs[y_new, x]
+                        new_state = (y_new * width + x) * 2 + 1
+                    if leg >= min_leg:
+                        relax(heap, dist, new_state, loss)
+        return -1, expanded
+
+    return search
+
+
+class HeatLossGrid:
+
+    """Heat loss digits of the city blocks, prepared for leg searches.
+
+    A state is a crucible standing on a cell after a leg along some axis,
+    numbered (y * width + x) * 2 + axis, with axis 0 for horizontal and 1
+    for vertical legs. The next leg turns to the other axis. Heat loss of
+    a leg is a difference of prefix sums of its row or column.
+
+    Attrs:
+        shape: Grid height and width.
+        strategies: Search strategies of `search`.
+        row_sums: Per row, heat loss of the cells left of each x.
+        col_sums: Per column, heat loss of the cells above each y.
+    """
+
+    strategies = ("dijkstra", "astar", "manhattan", "bidirectional")
+
+    def __init__(self, rows: list[list[int]]) -> None:
+        self.shape = (len(rows), len(rows[0]))
+        self.costs = [cost for row in rows for cost in row]
+        self.row_sums = [[0, *itertools.accumulate(row)] for row in rows]
+        self.col_sums = [[0, *itertools.accumulate(col)] for col in zip(*rows)]
+        self._bounds: dict[tuple[int, int], list[int]] = {}
+
+    def state(self, y: int, x: int, axis: int) -> int:
+        """State number of a crucible at (y, x) after a leg along axis."""
+        return (y * self.shape[1] + x) * 2 + axis
+
+    def dial(
+        self,
+        start: tuple[int, int],
+        min_leg=1,
+        max_leg=3,
+        end: tuple[int, int] | None = None,
+        potential: list[int] | None = None,
+    ) -> tuple[list[int], int]:
+        """Least heat loss to each state by Dial's algorithm.
+
+        Legs lose at most 9 * max_leg heat, so a ring of that many buckets
+        plus one holds all queued states, by distance modulo its size.
+
+        With a potential, this is A* search: states are taken in order of
+        heat loss plus the potential of their cell, a lower bound of the
+        heat loss from there to the end, see `lower_bound`. The bound must
+        be consistent, and not grow more than 9 * max_leg over a leg.
+
+        Args:
+            start: Start cell, from which the first leg may go either way.
+            end: Stop when the least heat loss to this cell is known.
+            potential: Lower bound of heat loss to end, by cell.
+
+        Returns:
+            Tuple (least heat loss by state, number of expanded states).
+            States not reached have heat loss `float('inf')`.
+        """
+        height, width = self.shape
+        row_sums = self.row_sums
+        col_sums = self.col_sums
+        dist = [float("inf")] * (height * width * 2)
+        n_buckets = 9 * max_leg + 1 if potential is None else 18 * max_leg + 1
+        pot = potential or [0] * (height * width)
+        buckets = [[] for _ in range(n_buckets)]
+        end_cell = -1 if end is None else end[0] * width + end[1]
+
+        current = pot[start[0] * width + start[1]]
+        for axis in (0, 1):
+            dist[self.state(*start, axis)] = 0
+            buckets[current % n_buckets].append(self.state(*start, axis))
+        n_queued = 2
+        expanded = 0
+        while n_queued:
+            bucket = buckets[current % n_buckets]
+            while bucket:
+                state = bucket.pop()
+                n_queued -= 1
+                cell = state >> 1
+                if dist[state] + pot[cell] != current:
+                    continue
+                expanded += 1
+                if cell == end_cell:
+                    return dist, expanded
+                y, x = divmod(cell, width)
+                state_dist = dist[state]
+
+                if state & 1:
+                    sums = row_sums[y]
+                    base = sums[x + 1]
+                    for x_new in range(x + min_leg, min(x + max_leg, width - 1) + 1):
+                        new_dist = state_dist + sums[x_new + 1] - base
+                        new_cell = y * width + x_new
+                        if new_dist < dist[new_cell << 1]:
+                            dist[new_cell << 1] = new_dist
+                            buckets[(new_dist + pot[new_cell]) % n_buckets].append(
+                                new_cell << 1
+                            )
+                            n_queued += 1
+                    base = sums[x]
+                    for x_new in range(x - min_leg, max(x - max_leg, 0) - 1, -1):
+                        new_dist = state_dist + base - sums[x_new]
+                        new_cell = y * width + x_new
+                        if new_dist < dist[new_cell << 1]:
+                            dist[new_cell << 1] = new_dist
+                            buckets[(new_dist + pot[new_cell]) % n_buckets].append(
+                                new_cell << 1
+                            )
+                            n_queued += 1
+                else:
+                    sums = col_sums[x]
+                    base = sums[y + 1]
+                    for y_new in range(y + min_leg, min(y + max_leg, height - 1) + 1):
+                        new_dist = state_dist + sums[y_new + 1] - base
+                        new_cell = y_new * width + x
+                        if new_dist < dist[(new_cell << 1) | 1]:
+                            dist[(new_cell << 1) | 1] = new_dist
+                            buckets[(new_dist + pot[new_cell]) % n_buckets].append(
+                                (new_cell << 1) | 1
+                            )
+                            n_queued += 1
+                    base = sums[y]
+                    for y_new in range(y - min_leg, max(y - max_leg, 0) - 1, -1):
+                        new_dist = state_dist + base - sums[y_new]
+                        new_cell = y_new * width + x
+                        if new_dist < dist[(new_cell << 1) | 1]:
+                            dist[(new_cell << 1) | 1] = new_dist
+                            buckets[(new_dist + pot[new_cell]) % n_buckets].append(
+                                (new_cell << 1) | 1
+                            )
+                            n_queued += 1
+            current += 1
+        return dist, expanded
+
+    @cached_property
+    def cost_array(self) -> np.ndarray:
+        """Heat loss of cells as int8 array."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        return np.array(self.costs, dtype=np.int8).reshape(self.shape)
+
+    @cached_property
+    def _dist_array(self) -> np.ndarray:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        return np.empty(self.shape[0] * self.shape[1] * 2, dtype=np.int32)
+
+    def search_numba(
+        self, start: tuple[int, int], end: tuple[int, int], min_leg=1, max_leg=3
+    ) -> SearchResult:
+        """Least heat loss from start to end by Dijkstra's search, jitted.
+
+        The search runs on `cost_array` with a heap of (heat loss, state)
+        tuples, and keeps heat losses by state in a reused int32 array.
+        """
+        heat_loss, expanded = _compiled_search()(
+            self.cost_array, self._dist_array, *start, *end, min_leg, max_leg
+        )
+        return SearchResult(int(heat_loss), int(expanded))
+
+    def lower_bound(self, end: tuple[int, int]) -> list[int]:
+        """Least heat loss from each cell to end, ignoring leg rules.
+
+        Found by Dijkstra's search from the end, with single steps in any
+        direction, and kept for later searches to the same end.
+        """
+        if end in self._bounds:
+            return self._bounds[end]
+        height, width = self.shape
+        costs = self.costs
+        bound = [-1] * (height * width)
+        buckets = [[] for _ in range(10)]
+        buckets[0].append((0, end[0] * width + end[1]))
+        n_queued = 1
+        current = 0
+        while n_queued:
+            bucket = buckets[current % 10]
+            while bucket:
+                dist, cell = bucket.pop()
+                n_queued -= 1
+                if bound[cell] >= 0:
+                    continue
+                bound[cell] = dist
+                y, x = divmod(cell, width)
+                # Going from a neighbour to this cell loses heat of this cell
+                new_dist = dist + costs[cell]
+                for y_new, x_new in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                    if 0 <= y_new < height and 0 <= x_new < width:
+                        new_cell = y_new * width + x_new
+                        if bound[new_cell] < 0:
+                            buckets[new_dist % 10].append((new_dist, new_cell))
+                            n_queued += 1
+            current += 1
+        self._bounds[end] = bound
+        return bound
+
+    def manhattan_bound(self, end: tuple[int, int]) -> list[int]:
+        """Manhattan distance of each cell to end, times the least heat loss."""
+        height, width = self.shape
+        min_cost = min(self.costs)
+        return [
+            (abs(end[0] - y) + abs(end[1] - x)) * min_cost
+            for y in range(height)
+            for x in range(width)
+        ]
+
+    def _legs(
+        self, state: int, min_leg: int, max_leg: int, reverse=False
+    ) -> Iterator[tuple[int, int]]:
+        """Next states and heat loss of legs, or previous ones if reverse."""
+        height, width = self.shape
+        y, x = divmod(state >> 1, width)
+        # Forward legs turn from the last axis, reverse legs came along it
+        horizontal = bool(state & 1) != reverse
+        pos, size = (x, width) if horizontal else (y, height)
+        sums = self.row_sums[y] if horizontal else self.col_sums[x]
+        for leg in range(min_leg, max_leg + 1):
+            for new_pos in (pos + leg, pos - leg):
+                if not 0 <= new_pos < size:
+                    continue
+                if reverse:
+                    # Heat lost after leaving new_pos, up to and at pos
+                    lo, hi = (new_pos + 1, pos + 1) if new_pos < pos else (pos, new_pos)
+                else:
+                    lo, hi = (pos + 1, new_pos + 1) if new_pos > pos else (new_pos, pos)
+                cell = y * width + new_pos if horizontal else new_pos * width + x
+                yield (cell << 1) | (not horizontal) ^ reverse, sums[hi] - sums[lo]
+
+    def bidirectional(
+        self, start: tuple[int, int], end: tuple[int, int], min_leg=1, max_leg=3
+    ) -> SearchResult:
+        """Least heat loss by Dijkstra's search from both start and end.
+
+        The searches alternate, and stop once the sum of their current heat
+        losses is no less than the best path through a state seen by both.
+        """
+        queues = [[], []]
+        dists = [{}, {}]
+        for direction, (y, x) in enumerate((start, end)):
+            for axis in (0, 1):
+                dists[direction][self.state(y, x, axis)] = 0
+                queues[direction].append((0, self.state(y, x, axis)))
+        shared = dists[0].keys() & dists[1].keys()
+        best = 0 if shared else float("inf")
+        expanded = 0
+        done = [set(), set()]
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            direction = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            dist, state = heapq.heappop(queues[direction])
+            if state in done[direction]:
+                continue
+            done[direction].add(state)
+            expanded += 1
+            for new_state, loss in self._legs(state, min_leg, max_leg, direction == 1):
+                new_dist = dist + loss
+                if new_dist < dists[direction].get(new_state, float("inf")):
+                    dists[direction][new_state] = new_dist
+                    heapq.heappush(queues[direction], (new_dist, new_state))
+                    if new_state in dists[1 - direction]:
+                        best = min(best, new_dist + dists[1 - direction][new_state])
+        return SearchResult(-1 if best == float("inf") else best, expanded)
+
+    def search(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        min_leg=1,
+        max_leg=3,
+        strategy="dijkstra",
+    ) -> SearchResult:
+        """Least heat loss from start to end.
+
+        Strategy 'dijkstra' runs `dial` without bound, 'astar' with
+        `lower_bound` and 'manhattan' with `manhattan_bound` as potential,
+        and 'bidirectional' runs `bidirectional`. Heat loss is -1, if the
+        end is not reachable.
+        """
+        if strategy == "bidirectional":
+            return self.bidirectional(start, end, min_leg, max_leg)
+        potential = {
+            "dijkstra": lambda: None,
+            "astar": lambda: self.lower_bound(end),
+            "manhattan": lambda: self.manhattan_bound(end),
+        }[strategy]()
+        dist, expanded = self.dial(start, min_leg, max_leg, end, potential)
+        heat_loss = min(dist[self.state(*end, axis)] for axis in (0, 1))
+        return SearchResult(-1 if heat_loss == float("inf") else heat_loss, expanded)
+
+    def field(self, dist: list[int]) -> np.ndarray:
+        """Least heat loss by cell from state distances, -1 if not reached."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        by_state = np.array(dist, dtype=float).reshape(*self.shape, 2)
+        by_cell = by_state.min(axis=2)
+        return np.where(np.isinf(by_cell), -1, by_cell).astype(np.int64)
+
 
 class ClumsyCrucible(Puzzle):
 
@@ -11,19 +387,88 @@ class ClumsyCrucible(Puzzle):
 
     Each cell has an entry cost, and the legs must be of certain length.
     Therefore, basic Dijkstra's algorithm does not apply.
+
+    Attrs:
+        engines: Search implementations. Engine 'heap' runs `search_bfs`,
+          'dial' runs `HeatLossGrid.search` on integer states, and 'numba'
+          runs `HeatLossGrid.search_numba`, or 'dial' if numba is not
+          installed.
+        engine: Engine used by the puzzle parts, one of `engines`.
+        strategy: Search strategy of engine 'dial', one of
+          `HeatLossGrid.strategies`.
     """
 
-    def __init__(self, input_text: str) -> None:
+    engines = ("heap", "dial", "numba")
+
+    def __init__(self, input_text: str, engine="dial", strategy="dijkstra") -> None:
         super().__init__(input_text)
+        if engine not in self.engines:
+            raise ValueError(f"Unknown engine {engine!r}, use one of {self.engines}")
+        if strategy not in HeatLossGrid.strategies:
+            raise ValueError(
+                f"Unknown strategy {strategy!r}, use one of {HeatLossGrid.strategies}"
+            )
+        if engine == "numba" and importlib.util.find_spec("numba") is None:
+            warnings.warn("numba is not installed, using engine 'dial'", RuntimeWarning)
+            engine = "dial"
+        self.engine = engine
+        self.strategy = strategy
         self.rows = [[int(c) for c in row] for row in input_text.strip().split("\n")]
         self.shape = (len(self.rows), len(self.rows[0]))
+        self._fields: dict[tuple, np.ndarray] = {}
+
+    @cached_property
+    def grid(self) -> HeatLossGrid:
+        """Grid prepared for searches, shared by both parts."""
+        return HeatLossGrid(self.rows)
+
+    def least_heat_loss(self, start_node=(0, 0), min_leg=1, max_leg=3) -> int:
+        """Least heat loss from start to the bottom-right corner."""
+        if self.engine == "heap":
+            return self.search_bfs(start_node, min_leg=min_leg, max_leg=max_leg)
+
+        end_node = (self.shape[0] - 1, self.shape[1] - 1)
+        if self.engine == "numba":
+            return self.grid.search_numba(
+                start_node, end_node, min_leg, max_leg
+            ).heat_loss
+        result = self.grid.search(
+            start_node, end_node, min_leg, max_leg, strategy=self.strategy
+        )
+        return result.heat_loss
+
+    def distance_field(self, start_node=(0, 0), min_leg=1, max_leg=3) -> np.ndarray:
+        """Least heat loss from start to every cell, -1 where not reachable.
+
+        The field is computed once for each start and leg rule, and kept.
+        """
+        key = (tuple(start_node), min_leg, max_leg)
+        if key not in self._fields:
+            dist, _ = self.grid.dial(start_node, min_leg, max_leg)
+            self._fields[key] = self.grid.field(dist)
+        return self._fields[key]
+
+    def distance_fields(
+        self, leg_rules: Iterable[tuple[int, int]], start_node=(0, 0)
+    ) -> dict[tuple[int, int], np.ndarray]:
+        """Distance fields from start by (min_leg, max_leg) rule."""
+        return {
+            (min_leg, max_leg): self.distance_field(start_node, min_leg, max_leg)
+            for min_leg, max_leg in leg_rules
+        }
+
+    def heat_loss_to(
+        self, target: tuple[int, int], start_node=(0, 0), min_leg=1, max_leg=3
+    ) -> int:
+        """Least heat loss from start to target, -1 if not reachable."""
+        return int(self.distance_field(start_node, min_leg, max_leg)[target])
 
     def part1(self) -> str | int:
         """Least heat loss on the crucible path."""
-        return self.search_bfs(start_node=(0, 0), max_leg=3)
+        return self.least_heat_loss(start_node=(0, 0), max_leg=3)
 
     def part2(self) -> str | int:
-        return self.search_bfs(start_node=(0, 0), min_leg=4, max_leg=10)
+        return self.least_heat_loss(start_node=(0, 0), min_leg=4, max_leg=10)
 
     def search_bfs(self, start_node: tuple[int, int], min_leg=1, max_leg=3):
         """Do a breadth-first search for the minimum distance.
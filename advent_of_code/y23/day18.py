@@ -22,12 +22,18 @@ class Vertex:
 
     @classmethod
     def from_string(cls, string: str) -> "Vertex":
-        parts = string.split(" ")
-        return cls(Direction[parts[0]], int(parts[1]), parts[2][1:-1])
+        return cls.from_parts(string.split(" "))
 
     @classmethod
     def from_string_hex(cls, string: str) -> "Vertex":
-        parts = string.split(" ")
+        return cls.from_parts_hex(string.split(" "))
+
+    @classmethod
+    def from_parts(cls, parts: list[str]) -> "Vertex":
+        return cls(Direction[parts[0]], int(parts[1]), parts[2][1:-1])
+
+    @classmethod
+    def from_parts_hex(cls, parts: list[str]) -> "Vertex":
         hex_ = parts[2][1:-1]
         dist_val = int(hex_[1:-1], 16)
         dir_s = {"0": "R", "1": "D", "2": "L", "3": "U"}
@@ -53,14 +59,14 @@ class LavaductLagoon(Puzzle):
         last = self._points[-1]
         self._points.append((last[0] + dy * vertex.len, last[1] + dx * vertex.len))
 
+    def parse(self) -> list[list[str]]:
+        """Split dig plan rows into direction, length and colour."""
+        return [row.split(" ") for row in self.input_text.strip().splitlines()]
+
     def part1(self) -> str | int:
-        self.vertices = [
-            Vertex.from_string(i) for i in self.input_text.strip().splitlines()
-        ]
+        self.vertices = [Vertex.from_parts(parts) for parts in self.parsed]
         return area_by_vertices(self.points, boundary=1)
 
     def part2(self) -> str | int:
-        self.vertices = [
-            Vertex.from_string_hex(i) for i in self.input_text.strip().splitlines()
-        ]
+        self.vertices = [Vertex.from_parts_hex(parts) for parts in self.parsed]
         return area_by_vertices(self.points, boundary=1)
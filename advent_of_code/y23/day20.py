@@ -8,7 +8,7 @@ from enum import Enum
 import math
 
 from ..base import Puzzle
-from ..helpers import ResultCycler
+from ..helpers import ResultCycler, state_digest
 
 
 class Signal(Enum):
@@ -104,6 +104,19 @@ class PulsePropagation(Puzzle, ResultCycler):
             val += (hash(k) + 13) * 7
         return val
 
+    def cycle_state(self) -> bytes:
+        """Flip-flop states, conjunction memories, and latest pulse counts."""
+        bits = []
+        for module in self.modules.values():
+            if isinstance(module, FlipFlop):
+                bits.append(module.state == 1)
+            elif isinstance(module, Conjunction):
+                bits.extend(sig is Signal.high for sig in module.memory.values())
+        return bytes(bits) + repr(self._result).encode()
+
+    def fingerprint(self) -> bytes:
+        return state_digest(self.cycle_state())
+
     def get_result(self):
         return complex(*self._result)
 
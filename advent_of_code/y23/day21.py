@@ -1,16 +1,97 @@
 """https://adventofcode.com/2023/day/21"""
 
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
 from ..base import Puzzle
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def bfs_distances(
+    free: np.ndarray,
+    sources: Iterable[tuple[int, int]],
+    first_distance=0,
+    max_distance: int | None = None,
+) -> np.ndarray:
+    """Steps from the sources to each free cell, -1 if not reached.
+
+    Breadth-first search advances the whole frontier at once, one step
+    per iteration.
+
+    Args:
+        free: Boolean array of cells that can be stepped on.
+        sources: Cells (y, x) at first_distance, ignored if not free.
+        max_distance: Stop after this many steps.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    height, width = free.shape
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free
+    flat_free = padded.ravel()
+    dist = np.full(flat_free.size, -1, dtype=np.int32)
+    offsets = np.array([1, -1, width + 2, -(width + 2)])
+
+    frontier = np.array(
+        [(y + 1) * (width + 2) + x + 1 for y, x in sources], dtype=np.int64
+    )
+    frontier = np.unique(frontier[flat_free[frontier]])
+    distance = first_distance
+    dist[frontier] = distance
+    while frontier.size and (max_distance is None or distance < max_distance):
+        neighbours = (frontier[:, None] + offsets).ravel()
+        neighbours = neighbours[flat_free[neighbours] & (dist[neighbours] < 0)]
+        frontier = np.unique(neighbours)
+        distance += 1
+        dist[frontier] = distance
+    return dist.reshape(padded.shape)[1:-1, 1:-1]
+
+
+def parity_counts(dist: np.ndarray) -> np.ndarray:
+    """Cumulative number of cells by parity and distance.
+
+    Returns:
+        Array of shape (2, max distance + 1), where item [p, k] is the
+        number of cells at distance at most k, with parity p.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    hist = np.bincount(dist[dist >= 0].ravel(), minlength=1)
+    even = hist.copy()
+    even[1::2] = 0
+    return np.stack([np.cumsum(even), np.cumsum(hist - even)])
+
+
+def count_at(counts: np.ndarray, n_steps: int) -> int:
+    """Number of cells reachable in exactly n_steps, from `parity_counts`."""
+    return int(counts[n_steps % 2, min(n_steps, counts.shape[1] - 1)])
+
 
 class StepCounter(Puzzle):
+
+    """Garden plots reachable by an elf in an exact number of steps.
+
+    A plot is reachable in n steps, if it is at most n steps away and the
+    distance has the parity of n, as the elf can step back and forth.
+    """
+
     def __init__(self, input_text: str) -> None:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
         super().__init__(input_text)
         self.rows = self.input_text.strip().splitlines()
         self.shape = (len(self.rows), len(self.rows[0]))
         for i, row in enumerate(self.rows):
             if "S" in row:
                 self.start_pos = (i, row.index("S"))
+        self.free = np.array([[c != "#" for c in row] for row in self.rows])
+        self._distances: dict[tuple[int, int], np.ndarray] = {}
+        self._counts: dict[tuple[int, int], np.ndarray] = {}
 
     def take_step(self, locations: set[tuple[int, int]], not_allowed="#"):
         destinations = set()
@@ -31,11 +112,98 @@ class StepCounter(Puzzle):
                 destinations.add((new_y, new_x))
         return destinations
 
-    def n_loc(self, start_pos: tuple[int, int], n_steps: int):
-        locations = {start_pos}
-        for _ in range(n_steps):
-            locations = self.take_step(locations)
-        return len(locations)
+    def distances(self, start_pos: tuple[int, int]) -> np.ndarray:
+        """Steps from start to each plot, -1 if not reachable.
+
+        The start may be just outside of the map, in which case the elf
+        enters the map on the first step, and cannot return to the start.
+        """
+        if start_pos not in self._distances:
+            y, x = start_pos
+            if 0 <= y < self.shape[0] and 0 <= x < self.shape[1]:
+                dist = bfs_distances(self.free, [start_pos])
+            else:
+                neighbours = [(y, x - 1), (y, x + 1), (y - 1, x), (y + 1, x)]
+                inside = [
+                    (y_, x_)
+                    for y_, x_ in neighbours
+                    if 0 <= y_ < self.shape[0] and 0 <= x_ < self.shape[1]
+                ]
+                dist = bfs_distances(self.free, inside, first_distance=1)
+            self._distances[start_pos] = dist
+        return self._distances[start_pos]
+
+    def n_loc(self, start_pos: tuple[int, int], n_steps: int) -> int:
+        """Number of plots, where the elf can be after exactly n_steps."""
+        if n_steps == 0:
+            return 1
+        if start_pos not in self._counts:
+            self._counts[start_pos] = parity_counts(self.distances(start_pos))
+        return count_at(self._counts[start_pos], n_steps)
+
+    def tiled_counts(self, radius: int) -> np.ndarray:
+        """`parity_counts` up to radius from start, on the repeated map."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        n_tiles = radius // min(self.shape) + 1
+        tiled = np.tile(self.free, (2 * n_tiles + 1, 2 * n_tiles + 1))
+        start = (
+            self.start_pos[0] + n_tiles * self.shape[0],
+            self.start_pos[1] + n_tiles * self.shape[1],
+        )
+        return parity_counts(bfs_distances(tiled, [start], max_distance=radius))
+
+    def locs_infinite(
+        self, n_steps: int, n_periods=10, min_fit=8, max_cells=4 * 10**7
+    ) -> int:
+        """Number of plots reachable in exactly n_steps on the infinite map.
+
+        Once the search has spread over enough copies of the map, counts at
+        steps rest, rest + step, rest + 2 * step... grow as a quadratic,
+        where step is a multiple of the least common multiple of the map
+        height and width; usually the first one. Other multiples may fit a
+        quadratic for a few periods, and then deviate again.
+
+        The counts are found by a search over the repeated map for
+        n_periods, doubled until the counts of some step lie on a quadratic
+        over the later half of the search, at least min_fit + 2 counts. The
+        quadratic is then extrapolated to n_steps. Smaller step counts are
+        found directly.
+
+        The repeated map grows with the square of the period, so maps with
+        a large period, such as non-square maps of coprime sides, may not
+        settle within max_cells.
+
+        Raises:
+            ValueError: Counts did not settle before the repeated map grew
+              beyond max_cells.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        period = math.lcm(*self.shape)
+        while True:
+            radius = (n_periods + 1) * period
+            n_tiles = 2 * (min(radius, n_steps) // min(self.shape) + 1) + 1
+            if n_tiles**2 * self.free.size > max_cells:
+                raise ValueError(f"No quadratic growth within {radius} steps")
+            counts = self.tiled_counts(min(radius, n_steps))
+            if n_steps <= radius:
+                return count_at(counts, n_steps)
+
+            for multiple in range(1, n_periods // (min_fit + 2) + 1):
+                step = multiple * period
+                rest = n_steps % step
+                values = [count_at(counts, n) for n in range(rest, radius + 1, step)]
+                third_diffs = np.diff(values, n=3)
+                n_fit = max(min_fit, len(third_diffs) // 2)
+                if len(third_diffs) >= n_fit and not third_diffs[-n_fit:].any():
+                    # Newton's forward differences from the last three counts
+                    first, second, third = values[-3:]
+                    diff_1 = second - first
+                    diff_2 = third - 2 * second + first
+                    t = (n_steps - rest) // step - (len(values) - 3)
+                    return first + t * diff_1 + t * (t - 1) // 2 * diff_2
+            n_periods *= 2
 
     def part1(self) -> str | int:
         return self.n_loc(self.start_pos, 64)
@@ -97,4 +265,4 @@ class StepCounter(Puzzle):
         return ret
 
     def part2(self) -> str | int:
-        return self.locs_after(26501365)
+        return self.locs_infinite(26501365)
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    """Cache directory in tmp_path, with an input for 2023 day 1."""
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+    day_dir = tmp_path / "2023" / "1"
+    day_dir.mkdir(parents=True)
+    (day_dir / "input").write_text("1abc2\npqr3stu8vwx\n", encoding="utf-8")
+    return tmp_path
@@ -0,0 +1,53 @@
+import pytest
+
+from advent_of_code.answers import AnswerCache, AnswerMismatch, source_digest
+from advent_of_code.base import Puzzle
+from advent_of_code.runner import RunOptions, solve
+
+
+def test_source_digest():
+    digest = source_digest("advent_of_code.y23.day14")
+    assert digest == source_digest("advent_of_code.y23.day14")
+    assert digest != source_digest("advent_of_code.y23.day01")
+
+
+def test_answer_cache(cache_root):
+    cache = AnswerCache(2023, 1, "advent_of_code.y23.day01", "abc")
+    assert cache.get(1) is None
+    cache.put(1, 42)
+    assert cache.get(1) == "42"
+    assert cache.get(2) is None
+    assert AnswerCache(2023, 1, "advent_of_code.y23.day01", "abd").get(1) is None
+
+    cache.verify(1, 42)
+    cache.put(2, 7)
+    assert (cache.get(1), cache.get(2)) == ("42", "7")
+    assert cache.path(1) != cache.path(2)
+    with pytest.raises(AnswerMismatch):
+        cache.verify(1, 43)
+
+
+def test_solve_cached(cache_root):
+    assert solve(2023, 1, 1, RunOptions(cache_answers=True))[:2] == (50, False)
+    assert solve(2023, 1, 1, RunOptions(cache_answers=True))[:2] == ("50", True)
+    assert solve(2023, 1, 1)[:2] == (50, False)
+
+
+def test_solve_verify(cache_root):
+    data = (cache_root / "2023" / "1" / "input").read_text()
+    AnswerCache(2023, 1, "advent_of_code.y23.day01", data).put(1, 49)
+    with pytest.raises(AnswerMismatch):
+        solve(2023, 1, 1, RunOptions(cache_answers=True, verify=True))
+
+
+def test_solve_stream(cache_root):
+    options = RunOptions(cache_answers=True, stream=True)
+    answer, cached, input_hash = solve(2023, 1, 1, options)
+    assert (answer, cached) == (50, False)
+    assert input_hash == solve(2023, 1, 1)[2]
+    assert solve(2023, 1, 1, RunOptions(cache_answers=True))[:2] == ("50", True)
+
+
+def test_solve_cache_parsed(cache_root):
+    assert solve(2023, 1, 1, RunOptions(cache_parsed=True))[0] == 50
+    assert not Puzzle.cache_parsed
@@ -0,0 +1,93 @@
+import pytest
+
+from advent_of_code.base import Puzzle
+from advent_of_code.y23.day06 import WaitForIt
+
+
+class WordPuzzle(Puzzle):
+    n_parsed = 0
+
+    def parse(self) -> list[str]:
+        WordPuzzle.n_parsed += 1
+        return self.input_text.split()
+
+    def part1(self) -> str | int:
+        return len(self.parsed)
+
+    def part2(self) -> str | int:
+        return max(len(word) for word in self.parsed)
+
+
+@pytest.fixture(autouse=True)
+def reset_count():
+    WordPuzzle.n_parsed = 0
+
+
+def test_parse_once():
+    puzzle = WordPuzzle("a bb ccc")
+    assert puzzle.part1() == 3
+    assert puzzle.part2() == 3
+    assert WordPuzzle.n_parsed == 1
+
+
+def test_default_parse():
+    class TextPuzzle(Puzzle):
+        def part1(self) -> str | int:
+            return self.parsed
+
+        def part2(self) -> str | int:
+            return super().part2()
+
+    assert TextPuzzle("abc").part1() == "abc"
+
+
+def test_parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(WordPuzzle, "cache_parsed", True)
+
+    assert WordPuzzle("a bb ccc").part1() == 3
+    assert WordPuzzle("a bb ccc").part2() == 3
+    assert WordPuzzle.n_parsed == 1
+    assert len(list((tmp_path / "parsed").glob("*.pickle"))) == 1
+
+    assert WordPuzzle("dddd").part2() == 4
+    assert WordPuzzle.n_parsed == 2
+
+
+def test_parse_cache_imported_sources(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+    digests = []
+    monkeypatch.setattr(
+        "advent_of_code.base.source_digest", lambda name: digests.append(name) or "a"
+    )
+    puzzle = WaitForIt("Time: 7 15\nDistance: 9 40\n")
+    puzzle.cache_parsed = True
+    assert puzzle.part1() == 4 * 8
+    assert digests == ["advent_of_code.y23.day06"]
+    assert not WaitForIt.cache_parsed
+
+    monkeypatch.setattr("advent_of_code.base.source_digest", lambda name: "b")
+    puzzle = WaitForIt("Time: 7 15\nDistance: 9 40\n")
+    puzzle.cache_parsed = True
+    assert puzzle.part2() == WaitForIt("Time: 7 15\nDistance: 9 40\n").part2()
+    assert len(list((tmp_path / "parsed").glob("*.pickle"))) == 2
+
+
+class LinePuzzle(Puzzle):
+    streaming = True
+
+    def part1(self) -> str | int:
+        return sum(int(line) for line in self.lines())
+
+    def part2(self) -> str | int:
+        return max(int(line) for line in self.lines())
+
+
+def test_from_lines():
+    lines = ["1", "2", "3"]
+    puzzle = LinePuzzle.from_lines(lines)
+    assert puzzle.part1() == 6
+    assert puzzle.part2() == 3
+    assert LinePuzzle("1\n2\n3\n").part1() == 6
+
+    assert WordPuzzle.from_lines(lines).input_text == "1\n2\n3\n"
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from advent_of_code.base import Puzzle
+from advent_of_code.bench import (
+    TimingStats,
+    bench_record,
+    format_timings,
+    puzzle_kwargs,
+    time_puzzle,
+)
+
+
+class CountingPuzzle(Puzzle):
+    n_created = 0
+
+    def __init__(self, input_text: str, repeat="1") -> None:
+        super().__init__(input_text)
+        self.repeat = int(repeat)
+        CountingPuzzle.n_created += 1
+
+    def part1(self) -> str | int:
+        return len(self.input_text) * self.repeat
+
+    def part2(self) -> str | int:
+        return self.input_text.count("a")
+
+
+def test_timing_stats():
+    stats = TimingStats([3.0, 1.0, 2.0, 4.0])
+    assert stats.min == 1.0
+    assert stats.median == 2.5
+    assert stats.p95 == 4.0
+    assert stats.stddev == pytest.approx(1.290994)
+
+
+def test_timing_stats_single():
+    stats = TimingStats([0.5])
+    assert stats.p95 == 0.5
+    assert stats.stddev == 0.0
+
+
+def test_time_puzzle():
+    CountingPuzzle.n_created = 0
+    timings = time_puzzle(CountingPuzzle, "abc", part=2, repeat=3, warmup=2)
+    assert CountingPuzzle.n_created == 5
+    assert set(timings) == {"parse", "solve"}
+    assert all(len(stats.samples) == 3 for stats in timings.values())
+
+
+def test_time_puzzle_options():
+    timings = time_puzzle(
+        CountingPuzzle, "abc", part=1, repeat=1, warmup=0, options={"repeat": "2"}
+    )
+    assert len(timings["solve"].samples) == 1
+    with pytest.raises(TypeError):
+        time_puzzle(CountingPuzzle, "abc", part=1, options={"engine": "x"})
+
+
+class SlowParsePuzzle(CountingPuzzle):
+    def parse(self):
+        time.sleep(0.05)
+        return self.input_text
+
+    def part1(self) -> str | int:
+        return len(self.parsed)
+
+
+def test_time_puzzle_parse_phase():
+    timings = time_puzzle(SlowParsePuzzle, "abc", part=1, repeat=1, warmup=0)
+    assert timings["parse"].min >= 0.05
+    assert timings["solve"].min < 0.05
+
+
+class OptionsPuzzle(CountingPuzzle):
+    def __init__(self, input_text: str, workers=1, scale=1.0, verify=False, engine="a"):
+        super().__init__(input_text)
+
+
+def test_puzzle_kwargs():
+    options = {"workers": "4", "scale": "0.5", "verify": "true", "engine": "b"}
+    assert puzzle_kwargs(OptionsPuzzle, options) == {
+        "workers": 4,
+        "scale": 0.5,
+        "verify": True,
+        "engine": "b",
+    }
+    assert puzzle_kwargs(OptionsPuzzle, {"verify": "0"}) == {"verify": False}
+    assert puzzle_kwargs(CountingPuzzle, {"repeat": "2"}) == {"repeat": "2"}
+    for bad in ({"input_text": "x"}, {"engin": "b"}, {"workers": "a"}, {"verify": "2"}):
+        with pytest.raises(ValueError):
+            puzzle_kwargs(OptionsPuzzle, bad)
+
+
+def test_bench_record():
+    timings = {"parse": TimingStats([1.0]), "solve": TimingStats([2.0])}
+    record = bench_record(2023, 17, 1, timings, repeat=1)
+    assert record["timings"]["solve"]["median"] == 2.0
+    assert record["repeat"] == 1
+    assert format_timings(timings).splitlines()[2].split()[0] == "solve"
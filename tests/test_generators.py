@@ -0,0 +1,79 @@
+import contextlib
+import io
+
+import pytest
+import sympy
+
+from advent_of_code.generators import available, generate, write_input
+from advent_of_code.runner import import_solution
+
+
+def generated(day: int, scale: float, seed=1) -> str:
+    return "\n".join(generate(2023, day, scale=scale, seed=seed)) + "\n"
+
+
+def solve(day: int, text: str, part: int):
+    puzzle = import_solution(2023, day)(text)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return puzzle.part1() if part == 1 else puzzle.part2()
+
+
+def test_available():
+    assert available(2023) == [5, 7, 10, 14, 16, 17, 20, 21, 22, 23, 24, 25]
+    assert available(2015) == []
+    with pytest.raises(ValueError):
+        generate(2023, 3)
+
+
+def test_seeded():
+    assert generated(14, 0.1, seed=1) == generated(14, 0.1, seed=1)
+    assert generated(14, 0.1, seed=1) != generated(14, 0.1, seed=2)
+
+
+def test_write_input():
+    file_ = io.StringIO()
+    assert write_input(file_, 2023, 17, scale=0.1, batch_size=4) == 14
+    assert file_.getvalue() == generated(17, 0.1, seed=0)
+
+
+@pytest.mark.parametrize("day", [5, 7, 14, 16, 17, 22, 23])
+def test_solvable(day: int):
+    text = generated(day, 0.1)
+    assert solve(day, text, 1) > 0
+    assert solve(day, text, 2) > 0
+
+
+@pytest.mark.parametrize("scale, n_blocks", [(0.01, 2), (0.1, 4)])
+def test_pipe_maze(scale: float, n_blocks: int):
+    text = generated(10, scale)
+    assert len(text.splitlines()) == 4 * n_blocks + 1
+    assert solve(10, text, 1) == 4 * n_blocks**2
+    assert solve(10, text, 2) == 4 * n_blocks**2 - 3
+
+
+def test_module_network():
+    answer = solve(20, generated(20, 0.5), 2)
+    factors = sympy.factorint(answer)
+    assert len(factors) == 2
+    assert all(2048 < p < 4096 and n == 1 for p, n in factors.items())
+    assert solve(20, generated(20, 0.5), 1) > 0
+
+
+def test_garden():
+    rows = generated(21, 0.1).splitlines()
+    assert len(rows) == len(rows[0]) == 13
+    assert rows[6][6] == "S"
+    assert solve(21, "\n".join(rows), 1) > 0
+
+
+def test_hailstones():
+    text = generated(24, 0.01)
+    assert len(text.splitlines()) == 3
+    assert isinstance(solve(24, text, 2), int)
+
+
+def test_wiring_diagram():
+    text = generated(25, 0.01)
+    nodes = set(text.replace(":", "").split())
+    assert len(nodes) == 15
+    assert solve(25, text, 1) in [n * (15 - n) for n in range(5, 11)]
@@ -4,6 +4,9 @@ from numpy.testing import assert_array_equal
 import pytest
 
 from advent_of_code.helpers import (
+    CycleInfo,
+    FingerprintCollision,
+    PrefixSums,
     TermColour,
     ResultCycler,
     char_array_to_string,
@@ -11,6 +14,8 @@ from advent_of_code.helpers import (
     highlight_regex,
     to_numpy_array,
     partition_range,
+    state_digest,
+    strongly_connected_components,
 )
 
 
@@ -32,19 +37,133 @@ class DemoCycler(ResultCycler):
         self.result = self.i if self.i < 3 else (3 + (self.i - 3) % 5)
 
 
-@pytest.mark.parametrize("i", list(range(1, 15)) + [47, 99])
-def test_result_cycling(i):
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+@pytest.mark.parametrize("i", list(range(0, 15)) + [47, 99])
+def test_result_cycling(i, method):
     cycler = DemoCycler()
     expected = i if i < 3 else (3 + (i - 3) % 5)
-    assert cycler.find_result_after(i) == expected
+    assert cycler.find_result_after(i, method=method) == expected
 
 
-@pytest.mark.parametrize("i", list(range(1, 15)))  # + [47, 99])
-def test_result_cumulative(i):
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+@pytest.mark.parametrize("i", list(range(0, 15)) + [47, 99])
+def test_result_cumulative(i, method):
     cycler = DemoCycler()
     expected = [j if j < 3 else (3 + (j - 3) % 5) for j in range(1, i + 1)]
-    print(expected, sum(expected))
-    assert cycler.find_result_after(i, cumulative=True) == sum(expected)
+    assert cycler.find_result_after(i, cumulative=True, method=method) == sum(expected)
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_cycle_info(method):
+    cycler = DemoCycler()
+    assert cycler.find_result_after(1e9, method=method) == 3 + (1e9 - 3) % 5
+    assert cycler.cycle_info == CycleInfo(preamble=3, period=5)
+    assert cycler.cycle_info.reduce(10) == 5
+    with pytest.raises(ValueError):
+        cycler.find_result_after(10, method="hare")
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_cumulative_between(method):
+    cycler = DemoCycler()
+    with pytest.raises(ValueError):
+        cycler.cumulative_between(0, 5)
+    cycler.find_result_after(20, cumulative=True, method=method)
+
+    results = [j if j < 3 else (3 + (j - 3) % 5) for j in range(60)]
+    for start, stop in [(0, 0), (0, 60), (2, 9), (13, 47), (7, 8)]:
+        assert cycler.cumulative_between(start, stop) == sum(results[start:stop])
+    # 3 + 4 + 5 + 6 + 7 = 25 per period
+    assert cycler.cumulative_between(3, 3 + 5 * 10**12) == 25 * 10**12
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_cumulative_between_no_cycle(method):
+    cycler = DemoCycler()
+    assert cycler.find_result_after(2, cumulative=True, method=method) == 3
+    assert cycler.cycle_info is None
+    assert cycler.cumulative_between(1, 3) == 3
+    with pytest.raises(ValueError):
+        cycler.cumulative_between(0, 4)
+
+
+class LongCycler(DemoCycler):
+    """Period far beyond the cycles asked for."""
+
+    def run_cycle(self):
+        self.result = (self.result + 1) % 10**15
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_cycle_beyond_limit(method):
+    cycler = LongCycler()
+    assert cycler.find_result_after(1000, method=method) == 1000
+    assert cycler.cycle_info is None
+    cycler = LongCycler()
+    assert cycler.find_result_after(1000, cumulative=True, method=method) == 500500
+    assert cycler.cumulative_between(10, 20) == sum(range(10, 20))
+
+
+def test_prefix_sums():
+    sums = PrefixSums(capacity=2)
+    assert sums.total() == 0
+    for value in range(1, 11):
+        sums.append(value)
+    assert len(sums) == 10
+    assert sums.total() == 55
+    assert sums.total(2, 5) == 3 + 4 + 5
+    with pytest.raises(IndexError):
+        sums.total(0, 11)
+
+    complex_sums = PrefixSums()
+    complex_sums.append(1 + 2j)
+    complex_sums.append(3j)
+    assert complex_sums.total() == 1 + 5j
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2.5, 3],
+        [0.5, 1, 1j],
+        [2**62, 2**62, 2**62, -5],
+        [2**70, 1],
+        [True, 2, 3],
+    ],
+)
+def test_prefix_sums_mixed(values: list):
+    sums = PrefixSums(capacity=1)
+    for value in values:
+        sums.append(value)
+    for start in range(len(values) + 1):
+        for stop in range(start, len(values) + 1):
+            assert sums.total(start, stop) == sum(values[start:stop])
+
+
+class CollidingCycler(DemoCycler):
+    def fingerprint(self):
+        return self.result % 2
+
+    def cycle_state(self):
+        return self.result
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_fingerprint_collision(method):
+    assert CollidingCycler().find_result_after(20, method=method) != 5
+    with pytest.raises(FingerprintCollision):
+        CollidingCycler().find_result_after(20, method=method, verify=True)
+    with pytest.raises(NotImplementedError):
+        DemoCycler().find_result_after(20, method=method, verify=True)
+
+
+def test_state_digest():
+    assert len(state_digest(b"O.#")) == 16
+    assert state_digest("O.#") == state_digest(b"O.#")
+    array = np.arange(6, dtype=np.uint8)
+    assert state_digest(array) == state_digest(np.arange(6, dtype=np.uint8))
+    assert state_digest(array) != state_digest(array.reshape(2, 3))
+    assert state_digest(array) != state_digest(array.tobytes())
 
 
 def test_highlight_regex():
@@ -81,6 +200,18 @@ def test_to_numpy_array():
     assert_array_equal(to_numpy_array(input), expected)
 
 
+@pytest.mark.parametrize(
+    "data", [b"ab \n12Y", b"ab \n12Y\n", bytearray(b"ab \n12Y\n\n")]
+)
+def test_to_numpy_array_buffer(data):
+    expected = np.array([["a", "b", " "], ["1", "2", "Y"]], dtype="S1")
+    arr = to_numpy_array(data, "S")
+    assert_array_equal(arr, expected)
+    assert_array_equal(to_numpy_array(data), expected.astype("U1"))
+    if isinstance(data, bytearray):
+        assert np.shares_memory(arr, np.frombuffer(data, dtype="S1"))
+
+
 def test_numpy_array_text():
     """See if text is same after numpy handling."""
     sample = """...#......
@@ -115,3 +246,17 @@ def test_partition_range(
     expected: tuple[tuple[int, int], tuple[int, int], tuple[int, int]],
 ):
     assert partition_range(source, partition_with) == expected
+
+
+def test_strongly_connected_components():
+    # 0 -> 1 <-> 2 -> 3 -> 3, and 4 -> 0 not reachable from 0
+    successors = [(1,), (2,), (1, 3), (3,), (0,)]
+    component, n_components = strongly_connected_components(successors, roots=[0])
+    assert n_components == 3
+    assert component[1] == component[2]
+    assert component[3] < component[1] < component[0]
+    assert component[4] == -1
+
+    component, n_components = strongly_connected_components(successors)
+    assert n_components == 4
+    assert component[4] > component[0]
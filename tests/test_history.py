@@ -0,0 +1,80 @@
+import pytest
+
+from advent_of_code.history import (
+    append_records,
+    compare,
+    latest_durations,
+    load_records,
+    make_record,
+    mann_whitney_p,
+)
+
+
+def record(commit: str, samples: list[float], part=1, input_hash="abc", **extra):
+    dirty = extra.pop("dirty", False)
+    return make_record(2023, 22, part, samples, input_hash, (commit, dirty), **extra)
+
+
+def test_append_and_load(cache_root):
+    append_records([record("c1", [1.0]), record("c2", [2.0, 3.0])])
+    append_records([record("c3", [4.0])])
+    records = load_records()
+    assert [r["commit"] for r in records] == ["c1", "c2", "c3"]
+    assert records[0]["input_hash"] == "abc"
+    assert "python" in records[0]
+    assert latest_durations(records) == {"2023/22/1": 4.0}
+
+
+def test_options_key(cache_root):
+    rec = record("c1", [1.0])
+    rec["options"] = {"engine": "bitset"}
+    assert latest_durations([record("c0", [2.0]), rec]) == {
+        "2023/22/1": 2.0,
+        "2023/22/1 engine=bitset": 1.0,
+    }
+
+
+def test_mann_whitney():
+    assert mann_whitney_p([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) < 0.01
+    assert mann_whitney_p([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]) > 0.99
+    assert mann_whitney_p([1, 1, 1], [1, 1, 1]) == 1.0
+
+
+def test_compare_slower():
+    records = [
+        record("aaaa", [1.0, 1.1, 0.9, 1.05, 0.95]),
+        record("bbbb", [1.5, 1.6, 1.4, 1.55, 1.45]),
+        record("bbbb", [1.0, 1.1, 0.9, 1.05, 0.95], part=2),
+        record("aaaa", [1.0, 1.1, 0.9, 1.05, 0.95], part=2),
+        record("cccc", [2.0, 2.0, 2.0, 2.0, 2.0], part=2, input_hash="other"),
+    ]
+    comparisons = compare(records, head="bb")
+    assert [(c.key, c.base, c.slower) for c in comparisons] == [
+        ("2023/22/1", "aaaa", True),
+        ("2023/22/2", "aaaa", False),
+    ]
+    assert comparisons[0].ratio == pytest.approx(1.5)
+
+
+def test_compare_no_base():
+    records = [record("aaaa", [1.0]), record("bbbb", [1.0], input_hash="x")]
+    assert not compare(records, head="bbbb")
+
+
+def test_compare_source_and_dirty():
+    fast, slow = [1.0, 1.1, 0.9, 1.05, 0.95], [1.5, 1.6, 1.4, 1.55, 1.45]
+    records = [
+        record("aaaa", fast, source="bench"),
+        record("aaaa", slow, source="run"),
+        record("bbbb", slow, source="bench", dirty=True),
+        record("bbbb", fast, source="run"),
+        record("bbbb", fast, source="bench"),
+    ]
+    comparisons = compare(records, head="bbbb")
+    assert [(c.key, c.slower) for c in comparisons] == [
+        ("2023/22/1 (bench)", False),
+        ("2023/22/1 (run)", False),
+    ]
+    assert comparisons[0].ratio == pytest.approx(1.0)
+    assert comparisons[1].ratio < 1
+    assert not compare(records[2:3], head="bbbb")
@@ -0,0 +1,95 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from advent_of_code import registry
+from advent_of_code.runner import (
+    PartResult,
+    discover_puzzles,
+    find_puzzle_class,
+    format_table,
+    import_solution,
+    registry_source,
+    run_all,
+    scan_puzzles,
+    solve_part,
+)
+
+
+def test_discover_puzzles():
+    puzzles = discover_puzzles()
+    assert (2023, 1) in puzzles
+    assert (2021, 19) in puzzles
+    assert puzzles == sorted(puzzles)
+
+
+def test_registry_up_to_date():
+    """Regenerate with `python -m advent_of_code index` if this fails."""
+    assert registry.PUZZLES == scan_puzzles()
+    source = Path(registry.__file__).read_text(encoding="utf-8")
+    assert registry_source(scan_puzzles()) == source
+
+
+def test_import_solution():
+    assert import_solution(2023, 14).__name__ == "ParabolicReflectorDish"
+
+
+def test_import_solution_missing():
+    with pytest.raises(ModuleNotFoundError):
+        import_solution(2023, 26)
+
+
+def test_find_puzzle_class(tmp_path):
+    path = tmp_path / "day01.py"
+    path.write_text("class A:\n    pass\n\n\nclass B(base.Puzzle, X):\n    pass\n")
+    assert find_puzzle_class(path) == "B"
+
+
+def test_no_heavy_imports():
+    code = (
+        "import sys, advent_of_code.__main__;"
+        "import advent_of_code.y23.day14, advent_of_code.y23.day16;"
+        "import advent_of_code.y23.day17, advent_of_code.y23.day21;"
+        "print(' '.join(m for m in ('numpy', 'requests') if m in sys.modules))"
+    )
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert res.stdout.strip() == ""
+
+
+def test_solve_part(cache_root):
+    result = solve_part(2023, 1, 1)
+    assert result.answer == 12 + 38
+    assert result.status == "ok"
+    assert result.seconds >= 0
+
+
+def test_solve_part_failure(cache_root):
+    (cache_root / "2023" / "1" / "input").write_text("abc\n", encoding="utf-8")
+    result = solve_part(2023, 1, 1)
+    assert result.status == "FAIL"
+    assert result.error.startswith("ValueError")
+
+
+def test_run_all(cache_root):
+    results = list(run_all([(2023, 1)], workers=2))
+    assert sorted((r.part, r.answer) for r in results) == [(1, 50), (2, 50)]
+
+
+def test_format_table():
+    table = format_table(
+        [PartResult(2023, 2, 1, error="KeyError: 1"), PartResult(2023, 1, 1, 50, 0.25)]
+    )
+    lines = table.splitlines()
+    assert lines[0].split() == [
+        "year",
+        "day",
+        "part",
+        "answer",
+        "time",
+        "(s)",
+        "status",
+    ]
+    assert lines[1].split() == ["2023", "1", "1", "50", "0.250", "ok"]
+    assert lines[2].split() == ["2023", "2", "1", "FAIL", "KeyError:", "1"]
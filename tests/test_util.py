@@ -0,0 +1,142 @@
+import gzip
+import mmap
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from advent_of_code.helpers import to_numpy_array
+from advent_of_code.util import (
+    LineReader,
+    RateLimiter,
+    fetch_inputs,
+    get_data,
+    text_digest,
+)
+
+
+class AocHandler(BaseHTTPRequestHandler):
+    """Stand-in for adventofcode.com input downloads.
+
+    Day 3 fails once with a server error, day 4 does not exist.
+    """
+
+    requests_seen: list[str] = []
+    cookies_seen: set[str] = set()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.requests_seen.append(self.path)
+        self.cookies_seen.add(self.headers.get("Cookie"))
+        day = int(self.path.split("/")[3])
+        if day == 4 or (day == 3 and self.requests_seen.count(self.path) == 1):
+            self.send_response(404 if day == 4 else 500)
+            self.end_headers()
+            self.wfile.write(b"error page")
+            return
+        body = f"input of day {day}\n".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def aoc_server(tmp_path, monkeypatch):
+    AocHandler.requests_seen = []
+    AocHandler.cookies_seen = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AocHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("AOC_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".aoc_session_id").write_text("abc123\n", encoding="utf-8")
+    yield tmp_path / "cache"
+    server.shutdown()
+
+
+def test_fetch_inputs(aoc_server):
+    outcomes = fetch_inputs(2023, [1, 2, 3, 4], workers=2, interval=0)
+    assert outcomes[1] == outcomes[2] == outcomes[3] == "downloaded"
+    assert "HTTP 404" in outcomes[4]
+
+    assert (aoc_server / "2023" / "3" / "input").read_text() == "input of day 3\n"
+    assert not (aoc_server / "2023" / "4" / "input").exists()
+    assert AocHandler.requests_seen.count("/2023/day/3/input") == 2
+    assert AocHandler.cookies_seen == {"session=abc123"}
+
+
+def test_fetch_cached(aoc_server):
+    fetch_inputs(2023, [1], interval=0)
+    assert fetch_inputs(2023, [1], interval=0) == {1: "cached"}
+    assert fetch_inputs(2023, [1], interval=0, force=True) == {1: "downloaded"}
+    assert len(AocHandler.requests_seen) == 2
+
+
+def test_get_data(aoc_server):
+    assert get_data(2023, 2) == "input of day 2\n"
+    assert get_data(2023, 2) == "input of day 2\n"
+    assert len(AocHandler.requests_seen) == 1
+
+    with pytest.raises(UserWarning):
+        get_data(2023, 4)
+    assert not (aoc_server / "2023" / "4" / "input").exists()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+    day_dir = tmp_path / "2023" / "14"
+    day_dir.mkdir(parents=True)
+    return day_dir
+
+
+def test_get_data_modes(cache_dir):
+    (cache_dir / "input").write_bytes(b"O.#\n.O.\n")
+    assert get_data(2023, 14) == "O.#\n.O.\n"
+    assert get_data(2023, 14, mode="bytes") == b"O.#\n.O.\n"
+
+    mapped = get_data(2023, 14, mode="mmap")
+    assert isinstance(mapped, mmap.mmap)
+    assert to_numpy_array(mapped, "S").tolist() == [
+        [b"O", b".", b"#"],
+        [b".", b"O", b"."],
+    ]
+
+    with pytest.raises(ValueError):
+        get_data(2023, 14, mode="xml")
+
+
+def test_get_data_gzip(cache_dir):
+    with gzip.open(cache_dir / "input.gz", "wb") as file_:
+        file_.write(b"O.#\n")
+    assert get_data(2023, 14) == "O.#\n"
+    assert get_data(2023, 14, mode="mmap") == b"O.#\n"
+    assert list(get_data(2023, 14, mode="lines")) == ["O.#"]
+
+
+def test_line_reader(cache_dir):
+    (cache_dir / "input").write_bytes(b"first\nsecond line\n\nlast")
+    lines = get_data(2023, 14, mode="lines")
+    assert isinstance(lines, LineReader)
+    assert list(lines) == ["first", "second line", "", "last"]
+    assert list(lines) == list(LineReader(lines.path, chunk_size=4))
+    assert lines.digest() == text_digest(get_data(2023, 14))
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(0.05)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.1
+
+
+def test_text_digest():
+    assert text_digest("abc") == text_digest(b"abc")
+    assert len(text_digest("abc")) == 64
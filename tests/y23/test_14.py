@@ -1,8 +1,14 @@
 import pytest
 
+from advent_of_code.generators import generate
 from advent_of_code.y23.day14 import ParabolicReflectorDish
 
 
+@pytest.fixture(params=list(ParabolicReflectorDish.engines))
+def engine(request) -> str:
+    return request.param
+
+
 @pytest.fixture
 def sample_input() -> str:
     return """O....#....
@@ -65,13 +71,13 @@ def test_pack_reverse(original, expected):
     )
 
 
-def test_pack_north(sample_input: str, sample_packed: str):
-    prd = ParabolicReflectorDish(sample_input)
+def test_pack_north(sample_input: str, sample_packed: str, engine: str):
+    prd = ParabolicReflectorDish(sample_input, engine=engine)
     assert prd.pack_north().pattern == sample_packed
 
 
-def test_pack_twice(sample_input: str, sample_packed: str):
-    prd = ParabolicReflectorDish(sample_input)
+def test_pack_twice(sample_input: str, sample_packed: str, engine: str):
+    prd = ParabolicReflectorDish(sample_input, engine=engine)
     assert prd.pack_north().pack_north().pattern == sample_packed
 
 
@@ -119,16 +125,45 @@ def test_pack_twice(sample_input: str, sample_packed: str):
         ),
     ],
 )
-def test_pack_cycle(sample_input: str, cycles: int, expected: str):
-    prd = ParabolicReflectorDish(sample_input)
+def test_pack_cycle(sample_input: str, cycles: int, expected: str, engine: str):
+    prd = ParabolicReflectorDish(sample_input, engine=engine)
     for _ in range(cycles):
         prd.pack_cycle()
     assert prd.pattern == expected
 
 
-def test_part1(sample_input: str):
-    assert ParabolicReflectorDish(sample_input).part1() == 136
+def test_part1(sample_input: str, engine: str):
+    assert ParabolicReflectorDish(sample_input, engine=engine).part1() == 136
+
+
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_part2(sample_input: str, method: str, engine: str):
+    dish = ParabolicReflectorDish(sample_input, engine=engine)
+    dish.cycle_method = method
+    dish.verify_cycle = True
+    assert dish.part2() == 64
+    assert (dish.cycle_info.preamble, dish.cycle_info.period) == (3, 7)
+
+
+def test_engines_agree():
+    text = "\n".join(generate(2023, 14, scale=0.3, seed=2))
+    dishes = [
+        ParabolicReflectorDish(text, engine=e) for e in ParabolicReflectorDish.engines
+    ]
+    for direction in "NWSWEESN":
+        for dish in dishes:
+            dish.engine.tilt(direction)
+        assert len({dish.pattern for dish in dishes}) == 1
+        assert len({dish.total_load() for dish in dishes}) == 1
+
+
+@pytest.mark.parametrize("text", ["##\n##", "#"])
+def test_no_free_cells(text: str, engine: str):
+    dish = ParabolicReflectorDish(text, engine=engine)
+    assert (dish.part1(), dish.part2()) == (0, 0)
+    assert dish.pattern == text
 
 
-def test_part2(sample_input: str):
-    assert ParabolicReflectorDish(sample_input).part2() == 64
+def test_unknown_engine(sample_input: str):
+    with pytest.raises(ValueError, match=r"\['bitset', 'numba', 'numpy', 'string'\]"):
+        ParabolicReflectorDish(sample_input, engine="abacus")
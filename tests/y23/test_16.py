@@ -1,6 +1,13 @@
+import numpy as np
 import pytest
 
-from advent_of_code.y23.day16 import TheFloorWillBeLava
+from advent_of_code.generators import generate
+from advent_of_code.y23.day16 import (
+    Beam,
+    BeamGraph,
+    BeamSimulator,
+    TheFloorWillBeLava,
+)
 
 
 @pytest.fixture
@@ -18,8 +25,49 @@ def sample_input() -> str:
 
 
 def test_part1(sample_input: str):
-    assert TheFloorWillBeLava(sample_input).part1() == 46
+    puzzle = TheFloorWillBeLava(sample_input)
+    assert puzzle.part1() == 46
+    assert not hasattr(puzzle, "energized")
 
 
-def test_part2(sample_input: str):
-    assert TheFloorWillBeLava(sample_input).part2() == 51
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"strategy": "simulate"}, {"strategy": "simulate", "workers": "2"}],
+)
+def test_part2(sample_input: str, options: dict):
+    assert TheFloorWillBeLava(sample_input, **options).part2() == 51
+
+
+def test_unknown_strategy(sample_input: str):
+    with pytest.raises(ValueError):
+        TheFloorWillBeLava(sample_input, strategy="guess")
+
+
+def test_strategies_match_reference():
+    puzzle = TheFloorWillBeLava("\n".join(generate(2023, 16, scale=0.2, seed=3)))
+    entries = puzzle.entries()
+    expected = []
+    for y, x, dir_ in entries:
+        dy, dx = Beam._dirs[dir_]
+        expected.append(puzzle._max_energized(Beam(y - dy, x - dx, dir_)))
+
+    graph = BeamGraph(puzzle.rows)
+    assert graph.energized(graph.state(*entry) for entry in entries) == expected
+    simulator = BeamSimulator(puzzle.rows)
+    assert [simulator.energized(*entry) for entry in entries] == expected
+
+
+def test_trace(sample_input: str, tmp_path):
+    trace = TheFloorWillBeLava(sample_input).trace()
+    assert trace.data.shape == (6, 10, 10)
+    assert trace.energized.sum() == 46
+    assert trace.visits[0, 0] == 1
+    assert trace.splits.sum() > 0
+    assert (trace.visits > 0).sum() == 46
+
+    trace.save(tmp_path / "trace.npy")
+    assert (np.load(tmp_path / "trace.npy") == trace.data).all()
+    trace.save(tmp_path / "trace.png")
+    assert (tmp_path / "trace.png").stat().st_size > 0
+    with pytest.raises(ValueError):
+        trace.save(tmp_path / "trace.txt")
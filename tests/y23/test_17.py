@@ -1,6 +1,7 @@
 import pytest
 
-from advent_of_code.y23.day17 import ClumsyCrucible
+from advent_of_code.generators import generate
+from advent_of_code.y23.day17 import ClumsyCrucible, HeatLossGrid
 
 
 @pytest.fixture
@@ -20,9 +21,89 @@ def sample_input() -> str:
 4322674655533"""
 
 
-def test_part1(sample_input: str):
-    assert ClumsyCrucible(sample_input).part1() == 102
+@pytest.fixture(params=ClumsyCrucible.engines)
+def engine(request) -> str:
+    return request.param
 
 
-def test_part2(sample_input: str):
-    assert ClumsyCrucible(sample_input).part2() == 94
+def test_part1(sample_input: str, engine: str):
+    assert ClumsyCrucible(sample_input, engine=engine).part1() == 102
+
+
+def test_part2(sample_input: str, engine: str):
+    assert ClumsyCrucible(sample_input, engine=engine).part2() == 94
+
+
+def test_engines_agree():
+    text = "\n".join(generate(2023, 17, scale=0.2, seed=5))
+    answers = {
+        engine: (
+            ClumsyCrucible(text, engine).part1(),
+            ClumsyCrucible(text, engine).part2(),
+        )
+        for engine in ClumsyCrucible.engines
+    }
+    assert len(set(answers.values())) == 1
+
+
+def test_unknown_engine(sample_input: str):
+    with pytest.raises(ValueError):
+        ClumsyCrucible(sample_input, engine="teleport")
+
+
+def test_distance_fields(sample_input: str):
+    puzzle = ClumsyCrucible(sample_input)
+    fields = puzzle.distance_fields([(1, 3), (4, 10)])
+    assert set(fields) == {(1, 3), (4, 10)}
+    assert fields[(1, 3)].shape == (13, 13)
+    assert fields[(1, 3)][0, 0] == fields[(4, 10)][0, 0] == 0
+    assert fields[(1, 3)][-1, -1] == 102
+    assert fields[(4, 10)][-1, -1] == 94
+    assert fields[(1, 3)][0, 1] == 4
+
+    assert puzzle.heat_loss_to((12, 12), min_leg=4, max_leg=10) == 94
+    assert puzzle.distance_field(min_leg=4, max_leg=10) is fields[(4, 10)]
+
+
+def test_distance_field_unreachable():
+    field = ClumsyCrucible("11111\n11111").distance_field(min_leg=4, max_leg=10)
+    assert field.tolist() == [[0, -1, -1, -1, 4], [-1, -1, -1, -1, -1]]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("leg_rule", [(1, 3), (4, 10)])
+def test_strategies(seed: int, leg_rule: tuple[int, int]):
+    puzzle = ClumsyCrucible("\n".join(generate(2023, 17, scale=0.15, seed=seed)))
+    end = (puzzle.shape[0] - 1, puzzle.shape[1] - 1)
+    expected = puzzle.search_bfs((0, 0), *leg_rule)
+    results = {
+        strategy: puzzle.grid.search((0, 0), end, *leg_rule, strategy=strategy)
+        for strategy in HeatLossGrid.strategies
+    }
+    assert all(result.heat_loss == expected for result in results.values())
+    assert results["astar"].expanded < results["dijkstra"].expanded
+
+
+@pytest.mark.parametrize("strategy", HeatLossGrid.strategies)
+def test_search_special_cases(strategy: str):
+    grid = ClumsyCrucible("11111\n11111").grid
+    assert grid.search((0, 0), (0, 0), 4, 10, strategy).heat_loss == 0
+    assert grid.search((0, 0), (0, 4), 4, 10, strategy).heat_loss == 4
+    assert grid.search((0, 0), (1, 4), 4, 10, strategy).heat_loss == -1
+
+
+def test_numba_fallback(sample_input: str, monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    with pytest.warns(RuntimeWarning):
+        puzzle = ClumsyCrucible(sample_input, engine="numba")
+    assert puzzle.engine == "dial"
+    assert puzzle.part1() == 102
+
+
+def test_search_numba(sample_input: str):
+    grid = ClumsyCrucible(sample_input).grid
+    result = grid.search_numba((0, 0), (12, 12), 4, 10)
+    assert result.heat_loss == 94
+    assert 0 < result.expanded <= 2 * 13 * 13
+    grid = ClumsyCrucible("11111\n11111").grid
+    assert grid.search_numba((0, 0), (1, 4), 4, 10).heat_loss == -1
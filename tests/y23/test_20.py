@@ -137,8 +137,25 @@ def test_output(input_txt: str, expected_seq: tuple[str, ...]):
         ),
     ],
 )
-def test_part1(input_txt: str, expected):
-    assert PulsePropagation(input_txt).part1() == expected
+@pytest.mark.parametrize("method", ["index", "brent", "floyd"])
+def test_part1(input_txt: str, expected, method: str):
+    pulses = PulsePropagation(input_txt)
+    pulses.cycle_method = method
+    pulses.verify_cycle = True
+    assert pulses.part1() == expected
+
+
+def test_pulses_after_many_presses():
+    pulses = PulsePropagation(
+        r"""broadcaster -> a, b, c
+%a -> b
+%b -> c
+%c -> inv
+&inv -> a
+"""
+    )
+    pulses.find_result_after(1000, cumulative=True)
+    assert pulses.cumulative_between(1, 10**12 + 1) == complex(4, 8) * 10**12
 
 
 @pytest.mark.skip
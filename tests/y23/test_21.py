@@ -1,6 +1,8 @@
+import random
+
 import pytest
 
-from advent_of_code.y23.day21 import StepCounter
+from advent_of_code.y23.day21 import StepCounter, count_at
 
 
 @pytest.fixture
@@ -24,6 +26,15 @@ def test_part1(sample_input: str):
     assert sc.n_loc(sc.start_pos, 6) == 16
 
 
+@pytest.mark.parametrize("start", [(5, 5), (0, 0), (-1, 3), (11, 10), (4, 11)])
+def test_n_loc_matches_steps(sample_input: str, start: tuple[int, int]):
+    sc = StepCounter(sample_input)
+    locations = {start}
+    for n_steps in range(30):
+        assert sc.n_loc(start, n_steps) == len(locations)
+        locations = sc.take_step(locations)
+
+
 @pytest.mark.parametrize(
     "n, expected",
     [
@@ -135,6 +146,80 @@ def test_odd(n, sample_odd, sample_odd_stacked):
     assert count_stacked == part2
 
 
+@pytest.mark.parametrize(
+    "n, expected",
+    [
+        (6, 16),
+        (10, 50),
+        (50, 1594),
+        (100, 6536),
+        (500, 167004),
+        (1000, 668697),
+        (5000, 16733044),
+    ],
+)
+def test_locs_infinite(sample_input: str, n: int, expected: int):
+    assert StepCounter(sample_input).locs_infinite(n) == expected
+
+
+def brute_force_infinite(sc: StepCounter, n_steps: int) -> list[int]:
+    """Number of locations after each step up to n_steps, on the infinite map.
+
+    Steps are taken from the locations, which were not reachable two steps
+    earlier; the others lead to locations of one step earlier, again.
+    """
+    height, width = sc.shape
+    before, locations, new = set(), {sc.start_pos}, {sc.start_pos}
+    counts = [1]
+    for _ in range(n_steps):
+        stepped = {
+            (y + dy, x + dx)
+            for y, x in new
+            for dy, dx in [(0, -1), (0, 1), (-1, 0), (1, 0)]
+            if sc.rows[(y + dy) % height][(x + dx) % width] != "#"
+        }
+        new = stepped - before
+        before, locations = locations, before | stepped
+        counts.append(len(locations))
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_locs_infinite_random(seed: int):
+    rng = random.Random(seed)
+    height, width = rng.choice([(5, 5), (7, 5), (6, 9)])
+    rows = [rng.choices(".#", weights=(4, 1), k=width) for _ in range(height)]
+    rows[height // 2][width // 3] = "S"
+    sc = StepCounter("\n".join("".join(row) for row in rows))
+    counts = brute_force_infinite(sc, 60)
+    for n_steps in [0, 1, 7, 30, 59, 60]:
+        assert sc.locs_infinite(n_steps) == counts[n_steps]
+
+    # Counts on the repeated map, without extrapolation
+    exact = sc.tiled_counts(600)
+    for n_steps in [377, 500, 599]:
+        assert sc.locs_infinite(n_steps) == count_at(exact, n_steps)
+
+
+@pytest.mark.parametrize(
+    "garden, n_steps, expected",
+    [
+        (".##..#.\n#.#....\n.....##\n...##..\n...#S..", 777, 1686),
+        (".#.#.\n.....\n#.#.#\n.....\n.S...", 400, 116442),
+    ],
+)
+def test_locs_infinite_late_quadratic(garden: str, n_steps: int, expected: int):
+    """Some multiples of the period fit a quadratic only for a while."""
+    sc = StepCounter(garden)
+    assert brute_force_infinite(sc, n_steps)[-1] == expected
+    assert sc.locs_infinite(n_steps) == expected
+
+
+def test_locs_infinite_matches_locs_after(reddit_sample: str):
+    sc = StepCounter(reddit_sample)
+    assert sc.locs_infinite(1180148) == sc.locs_after(1180148)
+
+
 def stack_s(s: str, n: int) -> str:
     lines = s.replace("S", ".").strip().splitlines()
     lines_w = list(map("".join, zip(*([lines] * n))))